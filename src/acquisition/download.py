@@ -187,6 +187,46 @@ def load_band(
     return da
 
 
+def _same_grid(a: xr.DataArray, b: xr.DataArray) -> bool:
+    return a.indexes["x"].equals(b.indexes["x"]) and a.indexes["y"].equals(b.indexes["y"])
+
+
+def align_to_reference(
+    arrays: dict[str, xr.DataArray],
+    ref_name: str,
+    tolerance: float,
+) -> dict[str, xr.DataArray]:
+    """Snap every band onto the grid of ``arrays[ref_name]``.
+
+    Bands that already share one grid (e.g. all native-20m S2 bands after
+    reprojection) are reindexed together as a single Dataset, so the
+    nearest-neighbour index lookup runs once per distinct grid instead of once
+    per band. Bands are not merged across grids before reindexing: the outer
+    join would pad each band with NaN at the other grids' coordinates, and the
+    nearest lookup could then land on that padding.
+    """
+    ref = arrays[ref_name]
+    groups: list[list[str]] = []
+    for name, arr in arrays.items():
+        if name == ref_name or _same_grid(arr, ref):
+            continue
+        for group in groups:
+            if _same_grid(arr, arrays[group[0]]):
+                group.append(name)
+                break
+        else:
+            groups.append([name])
+
+    aligned = dict(arrays)
+    for group in groups:
+        reindexed = xr.Dataset({name: arrays[name] for name in group}).reindex_like(
+            ref, method="nearest", tolerance=tolerance,
+        )
+        for name in group:
+            aligned[name] = reindexed[name]
+    return aligned
+
+
 def load_bands(
     item: Item,
     band_names: list[str],
@@ -238,11 +278,7 @@ def load_bands(
         ref_name = "scl" if "scl" in arrays else next(iter(arrays))
         ref = arrays[ref_name]
         tolerance = target_resolution if target_resolution else 30.0
-        for name in list(arrays.keys()):
-            if name != ref_name:
-                arrays[name] = arrays[name].reindex_like(
-                    ref, method="nearest", tolerance=tolerance,
-                )
+        arrays = align_to_reference(arrays, ref_name, tolerance)
         logger.debug(
             "Aligned {} bands to '{}' grid ({}x{} pixels)",
             len(arrays), ref_name,
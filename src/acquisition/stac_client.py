@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Optional
 
 from loguru import logger
 from pystac import ItemCollection
@@ -40,6 +42,16 @@ def _build_datetime_range(
     return f"{start_dt.strftime('%Y-%m-%d')}/{end_dt.strftime('%Y-%m-%d')}"
 
 
+@lru_cache(maxsize=4)
+def _catalog(url: str, modifier: Optional[Callable] = None) -> Client:
+    """Open a STAC catalog once per (url, modifier) and reuse it.
+
+    ``Client.open`` fetches the root catalog over a fresh HTTPS connection;
+    caching the client saves that round trip on every search.
+    """
+    return Client.open(url, modifier=modifier)
+
+
 def search_element84(
     bbox: list[float] = AOI_BBOX,
     datetime_range: Optional[str] = None,
@@ -52,7 +64,7 @@ def search_element84(
     No authentication required.
     """
     logger.info("Querying Element84 Earth Search for {}", collection)
-    catalog = Client.open(ELEMENT84_URL)
+    catalog = _catalog(ELEMENT84_URL)
 
     if datetime_range is None:
         datetime_range = _build_datetime_range()
@@ -83,10 +95,7 @@ def search_planetary_computer(
     import planetary_computer
 
     logger.info("Querying Planetary Computer for {}", collection)
-    catalog = Client.open(
-        PLANETARY_COMPUTER_URL,
-        modifier=planetary_computer.sign_inplace,
-    )
+    catalog = _catalog(PLANETARY_COMPUTER_URL, modifier=planetary_computer.sign_inplace)
 
     if datetime_range is None:
         datetime_range = _build_datetime_range()
@@ -119,7 +128,7 @@ def search_nasa_hls(
     earthaccess.login(strategy="environment")
 
     logger.info("Querying NASA HLS")
-    catalog = Client.open(NASA_STAC_URL)
+    catalog = _catalog(NASA_STAC_URL)
 
     if datetime_range is None:
         datetime_range = _build_datetime_range()
@@ -143,32 +152,83 @@ def search_nasa_hls(
     return filtered
 
 
+def _search_hedged(search_kwargs: dict, hedge_delay: float) -> ItemCollection:
+    """Query Element84 and Planetary Computer concurrently.
+
+    A non-empty Element84 result is preferred: for the first ``hedge_delay``
+    seconds only Element84 can win; after that, the first non-empty result
+    does. An empty or failed Element84 search falls through to Planetary
+    Computer, which is already running, so the fallback costs the slower of
+    the two searches rather than their sum. Provider errors are logged; if
+    neither provider returns items, the empty result is returned or the
+    first error raised.
+    """
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        e84 = executor.submit(search_element84, **search_kwargs)
+        pc = executor.submit(search_planetary_computer, **search_kwargs)
+
+        if not wait([e84], timeout=hedge_delay).done:
+            logger.info(
+                "Element84 has not answered after {:.1f}s, accepting Planetary Computer",
+                hedge_delay,
+            )
+
+        pending = {e84, pc}
+        empty = None
+        errors = []
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # Element84 wins ties
+            for future in sorted(done, key=lambda f: f is not e84):
+                provider = "Element84" if future is e84 else "Planetary Computer"
+                if future.exception() is not None:
+                    logger.warning("{} search failed: {}", provider, future.exception())
+                    errors.append(future.exception())
+                    continue
+                items = future.result()
+                if len(items) > 0:
+                    return items
+                logger.warning("{} returned no results", provider)
+                empty = items
+        if empty is not None:
+            return empty
+        raise errors[0]
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def search_sentinel2_with_fallback(
     bbox: list[float] = AOI_BBOX,
     datetime_range: Optional[str] = None,
     max_cloud_cover: int = MAX_CLOUD_COVER,
     max_items: int = MAX_ITEMS_PER_SEARCH,
+    hedge: bool = False,
+    hedge_delay: float = 10.0,
 ) -> ItemCollection:
     """Search for Sentinel-2 imagery, falling back across providers.
 
-    Order: Element84 → Planetary Computer.
+    Order: Element84 → Planetary Computer, which is queried only after an
+    empty Element84 response. With ``hedge=True`` both are queried at once:
+    a non-empty Element84 result still wins, but a fallback costs the slower
+    search instead of both, and once Element84 has taken more than
+    ``hedge_delay`` seconds the first non-empty result wins.
     """
-    items = search_element84(
+    search_kwargs = dict(
         bbox=bbox,
         datetime_range=datetime_range,
         max_cloud_cover=max_cloud_cover,
         max_items=max_items,
     )
+    if hedge:
+        return _search_hedged(search_kwargs, hedge_delay)
+
+    items = search_element84(**search_kwargs)
     if len(items) > 0:
         return items
 
     logger.warning("Element84 returned no results, falling back to Planetary Computer")
-    return search_planetary_computer(
-        bbox=bbox,
-        datetime_range=datetime_range,
-        max_cloud_cover=max_cloud_cover,
-        max_items=max_items,
-    )
+    return search_planetary_computer(**search_kwargs)
 
 
 def search_landsat(
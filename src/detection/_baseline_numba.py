@@ -0,0 +1,70 @@
+"""Numba kernels for scene-scale z-score / delta against baselines.
+
+Each kernel fuses the whole expression into one pass instead of the 3–4
+full-array temporaries the xarray expression allocates. NumPy input runs the
+``prange`` kernels; dask blocks run the serial ones, since dask already
+spreads chunks over threads and numba's parallel kernels launched from dask
+worker threads can hang the interpreter at exit (TBB threading layer).
+Importing this module requires ``numba``; ``baseline.compute_zscore``
+imports it lazily.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, cache=True)
+def _zscore_1d(current, mean, std, min_std, out):
+    for i in prange(current.shape[0]):
+        s = std[i]
+        # `not s > min_std` also catches NaN std, like std.where(std > min_std)
+        if not s > min_std:
+            s = min_std
+        out[i] = (current[i] - mean[i]) / s
+
+
+@njit(cache=True)
+def _zscore_1d_serial(current, mean, std, min_std, out):
+    for i in range(current.shape[0]):
+        s = std[i]
+        if not s > min_std:
+            s = min_std
+        out[i] = (current[i] - mean[i]) / s
+
+
+@njit(parallel=True, cache=True)
+def _delta_1d(current, mean, out):
+    for i in prange(current.shape[0]):
+        out[i] = current[i] - mean[i]
+
+
+@njit(cache=True)
+def _delta_1d_serial(current, mean, out):
+    for i in range(current.shape[0]):
+        out[i] = current[i] - mean[i]
+
+
+def zscore(
+    current: np.ndarray,
+    mean: np.ndarray,
+    std: np.ndarray,
+    min_std: float,
+    parallel: bool = True,
+) -> np.ndarray:
+    """(current - mean) / max(std, min_std), elementwise with broadcasting."""
+    current, mean, std = np.broadcast_arrays(current, mean, std)
+    out = np.empty(current.shape, dtype=np.result_type(current, mean, std, np.float32))
+    kernel = _zscore_1d if parallel else _zscore_1d_serial
+    kernel(current.ravel(), mean.ravel(), std.ravel(), min_std, out.reshape(-1))
+    return out
+
+
+def delta(current: np.ndarray, mean: np.ndarray, parallel: bool = True) -> np.ndarray:
+    """current - mean, elementwise with broadcasting."""
+    current, mean = np.broadcast_arrays(current, mean)
+    out = np.empty(current.shape, dtype=np.result_type(current, mean, np.float32))
+    kernel = _delta_1d if parallel else _delta_1d_serial
+    kernel(current.ravel(), mean.ravel(), out.reshape(-1))
+    return out
@@ -18,6 +18,40 @@ from rasterio.transform import from_bounds
 
 from config.settings import BASELINES_DIR, BASELINE_MONTHS, TARGET_CRS
 
+# Arrays at least this large (a scene, not a test patch) go through the fused
+# Numba kernels in _baseline_numba.py when numba is installed.
+_NUMBA_MIN_SIZE = 1_000_000
+
+
+def _numba_kernels():
+    """Return the JIT kernel module, or None when numba is not installed."""
+    try:
+        from src.detection import _baseline_numba
+    except ImportError:
+        return None
+    return _baseline_numba
+
+
+def _apply_kernel(func, *arrays: xr.DataArray, **kwargs) -> xr.DataArray:
+    """Run a NumPy-in/NumPy-out kernel with the same join and attrs as arithmetic.
+
+    ``apply_ufunc`` defaults to ``join="exact"``; binary operators use the
+    ``arithmetic_join`` option (inner by default) and merge attrs with
+    ``drop_conflicts`` unless ``keep_attrs`` is set to False. Dask-backed
+    input runs the serial kernels: dask already parallelizes over chunks.
+    """
+    keep_attrs = xr.get_options()["keep_attrs"]
+    parallel = all(a.chunks is None for a in arrays)
+    return xr.apply_ufunc(
+        func,
+        *arrays,
+        kwargs={**kwargs, "parallel": parallel},
+        dask="parallelized",
+        output_dtypes=[np.result_type(*(a.dtype for a in arrays), np.float32)],
+        join=xr.get_options()["arithmetic_join"],
+        keep_attrs="drop_conflicts" if keep_attrs in ("default", True) else False,
+    )
+
 
 def save_baseline_cog(
     data: xr.DataArray,
@@ -193,9 +227,13 @@ def compute_zscore(
     xr.DataArray
         Z-score values. Negative values indicate below-normal conditions.
     """
-    # Clamp std to avoid division by near-zero
-    safe_std = std.where(std > min_std, other=min_std)
-    zscore = (current - mean) / safe_std
+    kernels = _numba_kernels() if current.size >= _NUMBA_MIN_SIZE else None
+    if kernels is not None:
+        zscore = _apply_kernel(kernels.zscore, current, mean, std, min_std=min_std)
+    else:
+        # Clamp std to avoid division by near-zero
+        safe_std = std.where(std > min_std, other=min_std)
+        zscore = (current - mean) / safe_std
     zscore.name = "zscore"
     return zscore
 
@@ -207,6 +245,10 @@ def compute_delta(current: xr.DataArray, mean: xr.DataArray) -> xr.DataArray:
 
     Negative values indicate current is below the historical average.
     """
-    delta = current - mean
+    kernels = _numba_kernels() if current.size >= _NUMBA_MIN_SIZE else None
+    if kernels is not None:
+        delta = _apply_kernel(kernels.delta, current, mean)
+    else:
+        delta = current - mean
     delta.name = "delta"
     return delta
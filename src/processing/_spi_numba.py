@@ -0,0 +1,182 @@
+"""Numba kernel for single-series SPI.
+
+Same fit and fallbacks as ``spi.compute_spi`` with an explicit reference
+period, written as an ``@njit`` function so it can be called per pixel from
+other compiled loops. Numba has no digamma / incomplete gamma / normal PPF,
+so small versions of those live here. Importing this module requires
+``numba``; ``spi._spi_kernel_jit`` imports it lazily.
+"""
+
+from __future__ import annotations
+
+import math
+
+from numba import njit
+
+_FPMIN = 1e-300
+_EPS = 1e-16
+
+
+@njit(cache=True)
+def _digamma(x):
+    """Digamma for x > 0: recurrence up to x >= 10, then asymptotic series.
+
+    NaN for x <= 0 or non-finite x, where the recurrence would not end.
+    """
+    if not (x > 0.0 and math.isfinite(x)):
+        return math.nan
+    r = 0.0
+    while x < 10.0:
+        r -= 1.0 / x
+        x += 1.0
+    f = 1.0 / (x * x)
+    return r + math.log(x) - 0.5 / x - f * (
+        1.0 / 12 - f * (1.0 / 120 - f * (1.0 / 252 - f * (1.0 / 240 - f / 132)))
+    )
+
+
+@njit(cache=True)
+def _trigamma(x):
+    """Trigamma for x > 0: recurrence up to x >= 10, then asymptotic series.
+
+    NaN for x <= 0 or non-finite x, as ``_digamma``.
+    """
+    if not (x > 0.0 and math.isfinite(x)):
+        return math.nan
+    r = 0.0
+    while x < 10.0:
+        r += 1.0 / (x * x)
+        x += 1.0
+    f = 1.0 / (x * x)
+    return r + 1.0 / x + 0.5 * f + f / x * (
+        1.0 / 6 - f * (1.0 / 30 - f * (1.0 / 42 - f * (1.0 / 30 - f * 5.0 / 66)))
+    )
+
+
+@njit(cache=True)
+def _gammainc(a, x):
+    """Regularized lower incomplete gamma P(a, x) (series / continued fraction)."""
+    if x <= 0.0:
+        return 0.0
+    log_prefactor = -x + a * math.log(x) - math.lgamma(a)
+    if x < a + 1.0:
+        ap = a
+        term = 1.0 / a
+        total = term
+        for _ in range(1000):
+            ap += 1.0
+            term *= x / ap
+            total += term
+            if abs(term) < abs(total) * _EPS:
+                break
+        return total * math.exp(log_prefactor)
+
+    # Modified Lentz evaluation of the continued fraction for Q(a, x)
+    b = x + 1.0 - a
+    c = 1.0 / _FPMIN
+    d = 1.0 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2.0
+        d = an * d + b
+        if abs(d) < _FPMIN:
+            d = _FPMIN
+        c = b + an / c
+        if abs(c) < _FPMIN:
+            c = _FPMIN
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < _EPS:
+            break
+    return 1.0 - math.exp(log_prefactor) * h
+
+
+@njit(cache=True)
+def _ndtri(p):
+    """Standard normal quantile for 0 < p < 1.
+
+    Abramowitz & Stegun 26.2.23 start (|error| < 4.5e-4), polished to full
+    double precision with Halley steps on erfc.
+    """
+    tail = min(p, 1.0 - p)
+    t = math.sqrt(-2.0 * math.log(tail))
+    x = t - (2.515517 + 0.802853 * t + 0.010328 * t * t) / (
+        1.0 + 1.432788 * t + 0.189269 * t * t + 0.001308 * t * t * t
+    )
+    if p < 0.5:
+        x = -x
+    for _ in range(3):
+        err = 0.5 * math.erfc(-x / math.sqrt(2.0)) - p
+        u = err * math.sqrt(2.0 * math.pi) * math.exp(0.5 * x * x)
+        x -= u / (1.0 + 0.5 * x * u)
+    return x
+
+
+@njit(cache=True)
+def _zscore(target, reference, total, n_valid):
+    """Z-score fallback; two-pass variance, as np.nanstd (no cancellation)."""
+    mean = total / n_valid if n_valid > 0 else 0.0
+    if n_valid > 1:
+        sq = 0.0
+        for v in reference:
+            if not math.isnan(v):
+                sq += (v - mean) ** 2
+        std = math.sqrt(sq / n_valid)
+    else:
+        std = 1.0
+    return (target - mean) / std if std > 0 else 0.0
+
+
+@njit(cache=True)
+def spi_kernel(reference, target):
+    """SPI of ``target`` against a mixed zero/gamma fit of ``reference``.
+
+    Matches ``compute_spi(np.append(reference, target), reference_period=reference)``.
+    """
+    if math.isnan(target):
+        return 0.0
+
+    n_valid = 0
+    n_nonzero = 0
+    total = 0.0
+    total_nz = 0.0
+    for v in reference:
+        if not math.isnan(v):
+            n_valid += 1
+            total += v
+            if v > 0:
+                n_nonzero += 1
+                total_nz += v
+
+    if n_nonzero < 10:
+        return _zscore(target, reference, total, n_valid)
+
+    mean_nz = total_nz / n_nonzero
+    var_nz = 0.0
+    mean_log = 0.0
+    for v in reference:
+        if v > 0:
+            var_nz += (v - mean_nz) ** 2
+            mean_log += math.log(v)
+    if math.sqrt(var_nz / n_nonzero) < 1e-10:
+        return 0.0
+    mean_log /= n_nonzero
+
+    # Closed-form gamma MLE (loc = 0), as spi._gamma_shape_mle. A nearly
+    # constant reference rounds s to 0, where the likelihood has no maximum
+    s = math.log(mean_nz) - mean_log
+    if not s > 0:
+        return _zscore(target, reference, total, n_valid)
+    k = (3.0 - s + math.sqrt((s - 3.0) ** 2 + 24.0 * s)) / (12.0 * s)
+    for _ in range(6):
+        k -= (math.log(k) - _digamma(k) - s) / (1.0 / k - _trigamma(k))
+    if not (k > 0 and math.isfinite(k)):
+        return _zscore(target, reference, total, n_valid)
+    scale = mean_nz / k
+
+    q = (n_valid - n_nonzero) / n_valid
+    cdf = q if target == 0 else q + (1.0 - q) * _gammainc(k, target / scale)
+    cdf = min(max(cdf, 0.001), 0.999)
+    return _ndtri(cdf)
@@ -14,6 +14,25 @@ S2_MASK_CLASSES = {0, 1, 3, 8, 9, 10}
 # SCL classes considered clear
 S2_CLEAR_CLASSES = {2, 4, 5, 6, 7, 11}  # Dark, Veg, Bare, Water, Snow
 
+# 256-entry lookup table: _SCL_LUT[code] is True for clear classes
+_SCL_LUT = np.zeros(256, dtype=bool)
+_SCL_LUT[list(S2_CLEAR_CLASSES)] = True
+
+
+def _scl_clear(scl: np.ndarray) -> np.ndarray:
+    """Look up the clear flag for every SCL code.
+
+    SCL arrives as float32 from ``load_band`` and may hold NaN after grid
+    alignment (or resampled, non-integer codes); NaN, non-integer and
+    out-of-range codes map to class 0 (no data).
+    """
+    if scl.dtype != np.uint8:
+        valid = (scl >= 0) & (scl < 256)
+        if scl.dtype.kind == "f":
+            valid &= scl == np.floor(scl)
+        scl = np.where(valid, scl, 0).astype(np.uint8)
+    return _SCL_LUT[scl]
+
 
 def mask_sentinel2(ds: xr.Dataset, scl_var: str = "scl") -> xr.Dataset:
     """Apply cloud mask to a Sentinel-2 dataset using the SCL band.
@@ -39,17 +58,25 @@ def mask_sentinel2(ds: xr.Dataset, scl_var: str = "scl") -> xr.Dataset:
 
     scl = ds[scl_var]
 
-    # Build boolean mask: True where pixel is clear
-    clear_mask = xr.zeros_like(scl, dtype=bool)
-    for cls in S2_CLEAR_CLASSES:
-        clear_mask = clear_mask | (scl == cls)
+    # Build boolean mask: True where pixel is clear (one table lookup per
+    # pixel). Dask-backed SCL (load_band chunks by CHUNK_SIZE) stays lazy and
+    # the lookup runs block by block across workers.
+    clear_mask = xr.apply_ufunc(
+        _scl_clear, scl, dask="parallelized", output_dtypes=[bool]
+    )
 
     # Apply mask to all non-SCL variables
     masked = ds.drop_vars(scl_var)
     masked = masked.where(clear_mask)
 
+    if clear_mask.chunks is not None:
+        # Counting clear pixels would compute the whole mask; leave it to
+        # compute_clear_percentage on the loaded result
+        logger.info("Cloud mask applied (lazy)")
+        return masked
+
     n_total = clear_mask.size
-    n_clear = int(clear_mask.sum().values) if hasattr(clear_mask.sum(), "values") else 0
+    n_clear = int(clear_mask.sum().values)
     pct = (n_clear / n_total * 100) if n_total > 0 else 0
     logger.info("Cloud mask applied: {:.1f}% clear pixels", pct)
 
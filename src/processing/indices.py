@@ -4,20 +4,39 @@ All formulas follow the specifications in the project methodology:
 - NDVI, EVI2 use broad NIR (B8 for S2, B5 for Landsat)
 - NDMI, NBR use narrow NIR (B8A for S2, B5 for Landsat) + SWIR bands
 - BSI combines blue, red, NIR, and SWIR1
+
+The index functions take an xr.Dataset, or any mapping of band name to
+NumPy array (then returning a plain, unnamed array).
 """
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from typing import Union
+
 import numpy as np
 import xarray as xr
 
+# Dataset input gives a named DataArray, a band name → ndarray mapping a plain array
+Bands = Union[xr.Dataset, Mapping[str, np.ndarray]]
+IndexArray = Union[xr.DataArray, np.ndarray]
+
 
-def _safe_divide(numerator: xr.DataArray, denominator: xr.DataArray) -> xr.DataArray:
+def _safe_divide(numerator: IndexArray, denominator: IndexArray) -> IndexArray:
     """Divide with protection against division by zero."""
-    return numerator / denominator.where(denominator != 0, other=np.nan)
+    if isinstance(denominator, xr.DataArray):
+        return numerator / denominator.where(denominator != 0, other=np.nan)
+    return numerator / np.where(denominator != 0, denominator, np.nan)
 
 
-def ndvi(ds: xr.Dataset, nir: str = "nir", red: str = "red") -> xr.DataArray:
+def _named(result: IndexArray, name: str) -> IndexArray:
+    """Name a DataArray result; plain arrays (mapping input) pass through."""
+    if isinstance(result, xr.DataArray):
+        result.name = name
+    return result
+
+
+def ndvi(ds: Bands, nir: str = "nir", red: str = "red") -> IndexArray:
     """Normalized Difference Vegetation Index.
 
     NDVI = (NIR - RED) / (NIR + RED)
@@ -25,11 +44,10 @@ def ndvi(ds: xr.Dataset, nir: str = "nir", red: str = "red") -> xr.DataArray:
     Landsat: (B5 - B4) / (B5 + B4) at 30m
     """
     result = _safe_divide(ds[nir] - ds[red], ds[nir] + ds[red])
-    result.name = "ndvi"
-    return result
+    return _named(result, "ndvi")
 
 
-def evi2(ds: xr.Dataset, nir: str = "nir", red: str = "red") -> xr.DataArray:
+def evi2(ds: Bands, nir: str = "nir", red: str = "red") -> IndexArray:
     """Enhanced Vegetation Index 2 (two-band version, no blue needed).
 
     EVI2 = 2.5 * (NIR - RED) / (NIR + 2.4 * RED + 1)
@@ -54,11 +72,10 @@ def evi2(ds: xr.Dataset, nir: str = "nir", red: str = "red") -> xr.DataArray:
     numerator = 2.5 * (ds[nir] - ds[red])
     denominator = ds[nir] + 2.4 * ds[red] + 1
     result = _safe_divide(numerator, denominator)
-    result.name = "evi2"
-    return result
+    return _named(result, "evi2")
 
 
-def ndmi(ds: xr.Dataset, nir: str = "nir08", swir16: str = "swir16") -> xr.DataArray:
+def ndmi(ds: Bands, nir: str = "nir08", swir16: str = "swir16") -> IndexArray:
     """Normalized Difference Moisture Index.
 
     NDMI = (NIR - SWIR1) / (NIR + SWIR1)
@@ -68,11 +85,10 @@ def ndmi(ds: xr.Dataset, nir: str = "nir08", swir16: str = "swir16") -> xr.DataA
     Best single index for deforestation detection in Caatinga/Cerrado transition.
     """
     result = _safe_divide(ds[nir] - ds[swir16], ds[nir] + ds[swir16])
-    result.name = "ndmi"
-    return result
+    return _named(result, "ndmi")
 
 
-def nbr(ds: xr.Dataset, nir: str = "nir08", swir22: str = "swir22") -> xr.DataArray:
+def nbr(ds: Bands, nir: str = "nir08", swir22: str = "swir22") -> IndexArray:
     """Normalized Burn Ratio.
 
     NBR = (NIR - SWIR2) / (NIR + SWIR2)
@@ -82,11 +98,10 @@ def nbr(ds: xr.Dataset, nir: str = "nir08", swir22: str = "swir22") -> xr.DataAr
     Excellent for fire-related clearing detection.
     """
     result = _safe_divide(ds[nir] - ds[swir22], ds[nir] + ds[swir22])
-    result.name = "nbr"
-    return result
+    return _named(result, "nbr")
 
 
-def savi(ds: xr.Dataset, nir: str = "nir", red: str = "red", L: float = 0.5) -> xr.DataArray:
+def savi(ds: Bands, nir: str = "nir", red: str = "red", L: float = 0.5) -> IndexArray:
     """Soil-Adjusted Vegetation Index.
 
     SAVI = 1.5 * (NIR - RED) / (NIR + RED + L)
@@ -97,17 +112,16 @@ def savi(ds: xr.Dataset, nir: str = "nir", red: str = "red", L: float = 0.5) ->
     numerator = 1.5 * (ds[nir] - ds[red])
     denominator = ds[nir] + ds[red] + L
     result = _safe_divide(numerator, denominator)
-    result.name = "savi"
-    return result
+    return _named(result, "savi")
 
 
 def bsi(
-    ds: xr.Dataset,
+    ds: Bands,
     blue: str = "blue",
     red: str = "red",
     nir: str = "nir",
     swir16: str = "swir16",
-) -> xr.DataArray:
+) -> IndexArray:
     """Bare Soil Index.
 
     BSI = ((SWIR1 + RED) - (NIR + BLUE)) / ((SWIR1 + RED) + (NIR + BLUE))
@@ -118,8 +132,7 @@ def bsi(
     numerator = (ds[swir16] + ds[red]) - (ds[nir] + ds[blue])
     denominator = (ds[swir16] + ds[red]) + (ds[nir] + ds[blue])
     result = _safe_divide(numerator, denominator)
-    result.name = "bsi"
-    return result
+    return _named(result, "bsi")
 
 
 def dnbr(nbr_pre: xr.DataArray, nbr_post: xr.DataArray) -> xr.DataArray:
@@ -152,20 +165,27 @@ LANDSAT_BAND_OVERRIDES = {
     "bsi":  {"nir": "nir08"},
 }
 
+# Per-sensor band name overrides: sensor → index name → band kwargs
+SENSOR_BAND_OVERRIDES = {
+    "sentinel2": {},
+    "landsat": LANDSAT_BAND_OVERRIDES,
+    "hls": LANDSAT_BAND_OVERRIDES,
+}
+
 
 def compute_index(
-    ds: xr.Dataset,
+    ds: Bands,
     index_name: str,
     sensor: str = "sentinel2",
-) -> xr.DataArray:
+) -> IndexArray:
     """Compute a vegetation/spectral index from a dataset.
 
     Automatically adjusts band names based on sensor type.
 
     Parameters
     ----------
-    ds : xr.Dataset
-        Dataset containing the required bands.
+    ds : xr.Dataset or Mapping[str, np.ndarray]
+        Dataset (or band name → array mapping) containing the required bands.
     index_name : str
         Name of the index to compute (e.g., "ndmi", "nbr", "evi2").
     sensor : str
@@ -173,15 +193,14 @@ def compute_index(
 
     Returns
     -------
-    xr.DataArray
-        Computed index values.
+    xr.DataArray or np.ndarray
+        Computed index values: a named DataArray for Dataset input, an
+        unnamed array for a mapping of NumPy arrays.
     """
     func = INDEX_FUNCTIONS[index_name]
 
-    # Apply band name overrides for Landsat
-    kwargs = {}
-    if sensor in ("landsat", "hls") and index_name in LANDSAT_BAND_OVERRIDES:
-        kwargs = LANDSAT_BAND_OVERRIDES[index_name]
+    # Apply band name overrides for the sensor (Landsat/HLS use nir08)
+    kwargs = SENSOR_BAND_OVERRIDES.get(sensor, {}).get(index_name, {})
 
     return func(ds, **kwargs)
 
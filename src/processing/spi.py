@@ -18,19 +18,146 @@ from typing import Optional
 
 import numpy as np
 from loguru import logger
-from scipy import stats
+from scipy import special
 
 from config.settings import AOI_BBOX
 
 
+def _namespace(a) -> tuple:
+    """Return (array module, special-functions module) for a NumPy or CuPy array."""
+    if type(a).__module__.startswith("cupy"):
+        import cupy
+        from cupyx.scipy import special as cupy_special
+
+        return cupy, cupy_special
+    return np, special
+
+
+def _gamma_shape_mle(s, n_iter: int = 6, xp=np, sp=special):
+    """Maximum-likelihood gamma shape from s = log(mean) - mean(log x).
+
+    Solves log(k) - digamma(k) = s (the loc=0 likelihood equation that
+    ``stats.gamma.fit(..., floc=0)`` solves) by Newton iterations from
+    Minka's closed-form approximation, elementwise over ``s``.
+    """
+    k = (3.0 - s + xp.sqrt((s - 3.0) ** 2 + 24.0 * s)) / (12.0 * s)
+    for _ in range(n_iter):
+        k = k - (xp.log(k) - sp.digamma(k) - s) / (1.0 / k - sp.polygamma(1, k))
+    return k
+
+
+def _spi_kernel_jit(reference: np.ndarray, target: float) -> float:
+    """Numba-compiled SPI of ``target`` against ``reference`` (requires numba).
+
+    Equivalent to ``compute_spi(np.append(reference, target),
+    reference_period=reference)``; for per-pixel loops, call
+    ``_spi_numba.spi_kernel`` directly from other ``@njit`` code.
+    """
+    from src.processing._spi_numba import spi_kernel
+
+    return spi_kernel(np.ascontiguousarray(reference, dtype=np.float64), float(target))
+
+
+def compute_spi_batched(
+    precipitation: np.ndarray,
+    reference_period: Optional[np.ndarray] = None,
+    axis: int = 0,
+) -> np.ndarray:
+    """Compute SPI for every value of many series at once (e.g. a raster stack).
+
+    Vectorized counterpart of :func:`compute_spi`: each series along
+    ``axis`` gets its own mixed zero/gamma fit, with the same fallbacks
+    (z-score below 10 non-zero values or when the gamma fit fails, 0 for
+    constant series), and every value in it is transformed with ``gdtr`` /
+    ``ndtri`` in one pass.
+    CuPy input stays on the GPU (``cupyx.scipy.special`` kernels).
+
+    Parameters
+    ----------
+    precipitation : np.ndarray
+        Precipitation stack, time along ``axis`` (e.g. shape (T, H, W)).
+    reference_period : np.ndarray, optional
+        Historical data for the fits, same shape as ``precipitation``
+        except along ``axis``. If None, uses ``precipitation``.
+    axis : int
+        Time axis.
+
+    Returns
+    -------
+    np.ndarray
+        SPI with the shape of ``precipitation`` (same array type); NaN where
+        the input is NaN.
+    """
+    xp, sp = _namespace(precipitation)
+    x = xp.moveaxis(xp.asarray(precipitation, dtype=xp.float64), axis, 0)
+    ref = x if reference_period is None else xp.moveaxis(
+        xp.asarray(reference_period, dtype=xp.float64), axis, 0
+    )
+
+    valid = ~xp.isnan(ref)
+    nonzero = valid & (ref > 0)
+    n_valid = valid.sum(axis=0)
+    n_nonzero = nonzero.sum(axis=0)
+
+    # Per-series moments without nan-reductions (no all-NaN warnings)
+    ref_valid = xp.where(valid, ref, 0.0)
+    ref_pos = xp.where(nonzero, ref, 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_all = xp.where(n_valid > 0, ref_valid.sum(axis=0) / n_valid, 0.0)
+        std_all = xp.sqrt((xp.where(valid, ref - mean_all, 0.0) ** 2).sum(axis=0) / n_valid)
+        std_all = xp.where(n_valid > 1, std_all, 1.0)
+        mean_nz = xp.where(nonzero, ref, 0.0).sum(axis=0) / n_nonzero
+        std_nz = xp.sqrt((xp.where(nonzero, ref - mean_nz, 0.0) ** 2).sum(axis=0) / n_nonzero)
+        mean_log_nz = xp.log(ref_pos).sum(axis=0) / n_nonzero
+
+    use_gamma = (n_nonzero >= 10) & (std_nz >= 1e-10)
+    use_zscore = n_nonzero < 10
+
+    n_fallback = int(use_zscore.sum())
+    if n_fallback:
+        logger.warning(
+            "{} series with fewer than 10 non-zero precipitation values; using z-score",
+            n_fallback,
+        )
+
+    # Gamma fit to the non-zero values, mixed with P(X = 0)
+    s = xp.where(use_gamma, xp.log(xp.where(use_gamma, mean_nz, 1.0)) - mean_log_nz, 1.0)
+    # Nearly constant series can round s to <= 0, where the MLE has no
+    # solution (and polygamma stalls on the infinite start): z-score those
+    # columns, as compute_spi does when its fit fails
+    shape = _gamma_shape_mle(xp.where(s > 0, s, 1.0), xp=xp, sp=sp)
+    failed_fit = use_gamma & ~((s > 0) & xp.isfinite(shape) & (shape > 0))
+    n_failed = int(failed_fit.sum())
+    if n_failed:
+        logger.warning("Gamma fit failed for {} series. Falling back to z-score.", n_failed)
+        use_gamma = use_gamma & ~failed_fit
+        use_zscore = use_zscore | failed_fit
+    shape = xp.where(use_gamma, shape, 1.0)
+    scale = xp.where(use_gamma, mean_nz, 1.0) / shape
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q = xp.where(n_valid > 0, (n_valid - n_nonzero) / n_valid, 0.0)
+    cdf = q + (1 - q) * sp.gdtr(1.0 / scale, shape, xp.maximum(x, 0.0))
+    spi = sp.ndtri(xp.clip(cdf, 0.001, 0.999))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zscore = xp.where(std_all > 0, (x - mean_all) / std_all, 0.0)
+    spi = xp.where(use_gamma, spi, xp.where(use_zscore, zscore, 0.0))
+    spi = xp.where(xp.isnan(x), xp.nan, spi)
+
+    return xp.moveaxis(spi, 0, axis)
+
+
 def compute_spi(
     precipitation: np.ndarray,
     reference_period: Optional[np.ndarray] = None,
-) -> float:
-    """Compute the Standardized Precipitation Index for a single value.
+    axis: Optional[int] = None,
+) -> float | np.ndarray:
+    """Compute the Standardized Precipitation Index of the last value of a series.
 
     Fits a gamma distribution to the reference precipitation data,
     then transforms the target value to a standard normal deviate.
+    Negative targets are treated as zero precipitation, as in
+    :func:`compute_spi_batched`.
 
     Parameters
     ----------
@@ -41,12 +168,30 @@ def compute_spi(
     reference_period : np.ndarray, optional
         Historical precipitation data for fitting the distribution.
         If None, uses all of `precipitation`.
+    axis : int, optional
+        Time axis of an N-D stack (e.g. 0 for (T, H, W)). When given, SPI
+        of the last time step is computed for every series at once via
+        :func:`compute_spi_batched` and returned as an array without that
+        axis. CuPy input always takes this path and returns a 0-d CuPy
+        array for a 1-D series.
 
     Returns
     -------
-    float
+    float or np.ndarray
         SPI value. Negative = drought, positive = wet.
     """
+    xp, _ = _namespace(precipitation)
+    if axis is None and xp is not np:
+        # Device arrays go through the batched kernels instead of host SciPy
+        axis = 0
+
+    if axis is not None:
+        spi = xp.take(
+            compute_spi_batched(precipitation, reference_period, axis=axis), -1, axis=axis
+        )
+        # NaN target → 0.0, as in the single-series path
+        return xp.nan_to_num(spi, nan=0.0)
+
     if reference_period is None:
         reference_period = precipitation
 
@@ -78,14 +223,18 @@ def compute_spi(
     # Probability of zero precipitation
     q = np.sum(ref_clean == 0) / len(ref_clean)
 
-    # Fit gamma to non-zero values
-    try:
-        shape, loc, scale = stats.gamma.fit(ref_nonzero, floc=0)
-    except Exception as e:
-        logger.warning("Gamma fit failed: {}. Falling back to z-score.", e)
+    # Fit gamma to non-zero values: closed-form MLE (same estimate as
+    # stats.gamma.fit(floc=0), without its numerical optimizer). A nearly
+    # constant reference rounds s to 0, where the MLE has no solution.
+    mean_nz = ref_nonzero.mean()
+    s = np.log(mean_nz) - np.log(ref_nonzero).mean()
+    shape = float(_gamma_shape_mle(s)) if s > 0 else np.nan
+    if not np.isfinite(shape) or shape <= 0:
+        logger.warning("Gamma fit failed (shape={}). Falling back to z-score.", shape)
         mean = np.nanmean(ref_clean)
         std = np.nanstd(ref_clean)
         return float((target - mean) / std) if std > 0 else 0.0
+    scale = mean_nz / shape
 
     # Transform the target value (already extracted above)
     if target == 0:
@@ -93,19 +242,19 @@ def compute_spi(
         cdf_val = q
     else:
         # Mixed distribution: P(X=0) + P(X>0) * gamma_CDF
-        gamma_cdf = stats.gamma.cdf(target, shape, loc=0, scale=scale)
+        gamma_cdf = special.gdtr(1.0 / scale, shape, max(target, 0.0))
         cdf_val = q + (1 - q) * gamma_cdf
 
     # Clamp to avoid infinite values at the tails
     cdf_val = np.clip(cdf_val, 0.001, 0.999)
 
     # Transform to standard normal
-    spi = float(stats.norm.ppf(cdf_val))
+    spi = float(special.ndtri(cdf_val))
 
     return spi
 
 
-def compute_spi_3month(monthly_precip: list[float]) -> float:
+def compute_spi_3month(monthly_precip: list[float] | np.ndarray) -> float:
     """Compute 3-month SPI from a series of monthly precipitation values.
 
     Sums the last 3 months of precipitation and compares against
@@ -113,16 +262,17 @@ def compute_spi_3month(monthly_precip: list[float]) -> float:
 
     Parameters
     ----------
-    monthly_precip : list[float]
+    monthly_precip : list[float] or np.ndarray
         Monthly precipitation values (mm). Must have at least 15 values
         for reliable gamma fitting. The last 3 values are the target period.
+        A float64 array is used as-is, without a copy.
 
     Returns
     -------
     float
         SPI-3 value for the most recent 3-month period.
     """
-    arr = np.array(monthly_precip, dtype=np.float64)
+    arr = np.asarray(monthly_precip, dtype=np.float64)
 
     if len(arr) < 3:
         logger.warning("Need at least 3 months for SPI-3, got {}", len(arr))
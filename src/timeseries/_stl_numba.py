@@ -0,0 +1,208 @@
+"""Numba implementation of STL (Cleveland et al., 1990).
+
+Port of the reference Fortran routine (the same one statsmodels wraps) with
+all smoothers of degree 1 and no jumps, so results match
+``statsmodels.tsa.seasonal.STL`` for the same parameters up to rounding
+(robust fits of series shorter than ~4 periods excepted, see
+``seasonal.stl_decomposition``). Only the LOESS
+kernels are JIT-compiled; the low-pass moving averages use
+``scipy.ndimage.uniform_filter1d``. Importing this module requires ``numba``;
+``seasonal.stl_decomposition`` imports it lazily.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numba import njit
+from scipy.ndimage import uniform_filter1d
+
+
+@njit(cache=True)
+def _loess_point(y, rw, use_rw, q, xs, nleft, nright):
+    """Tricube-weighted local linear fit of y at position xs.
+
+    Only the window [nleft, nright] is used. Returns NaN when every
+    weight in the window is zero.
+    """
+    n = y.shape[0]
+    h = max(xs - nleft, nright - xs)
+    if q > n:
+        h += (q - n) // 2
+    h9 = 0.999 * h
+    h1 = 0.001 * h
+
+    w = np.zeros(nright - nleft + 1)
+    total = 0.0
+    for j in range(nleft, nright + 1):
+        r = abs(j - xs)
+        if r <= h9:
+            if r <= h1:
+                wj = 1.0
+            else:
+                wj = (1.0 - (r / h) ** 3) ** 3
+            if use_rw:
+                wj *= rw[j]
+            w[j - nleft] = wj
+            total += wj
+    if total <= 0.0:
+        return np.nan
+
+    w /= total
+    if h > 0:
+        a = 0.0
+        for j in range(nleft, nright + 1):
+            a += w[j - nleft] * j
+        b = xs - a
+        c = 0.0
+        for j in range(nleft, nright + 1):
+            c += w[j - nleft] * (j - a) ** 2
+        if np.sqrt(c) > 0.001 * (n - 1):
+            b /= c
+            for j in range(nleft, nright + 1):
+                w[j - nleft] *= b * (j - a) + 1.0
+
+    ys = 0.0
+    for j in range(nleft, nright + 1):
+        ys += w[j - nleft] * y[j]
+    return ys
+
+
+@njit(cache=True)
+def _loess(y, rw, use_rw, q, start, n_out):
+    """Evaluate the LOESS smoother of y at positions start..start+n_out-1."""
+    n = y.shape[0]
+    half = (q - 1) // 2
+    out = np.empty(n_out)
+    for i in range(n_out):
+        xs = start + i
+        if q >= n:
+            nleft = 0
+            nright = n - 1
+        else:
+            nleft = min(max(xs - half, 0), n - q)
+            nright = nleft + q - 1
+        out[i] = _loess_point(y, rw, use_rw, q, xs, nleft, nright)
+    return out
+
+
+def _moving_average(x: np.ndarray, length: int) -> np.ndarray:
+    """Valid-mode moving average (len(x) - length + 1 outputs)."""
+    smoothed = uniform_filter1d(x, size=length, mode="reflect")
+    return smoothed[length // 2 : x.shape[0] - (length - 1) // 2]
+
+
+@njit(cache=True)
+def _cycle_subseries(detrended, rw, use_rw, period, n_s):
+    """Smooth each cycle-subseries, extended by one period on both ends."""
+    n = detrended.shape[0]
+    c = np.empty(n + 2 * period)
+    for j in range(period):
+        sub = detrended[j::period]
+        sub_rw = rw[j::period]
+        k = sub.shape[0]
+        smoothed = _loess(sub, sub_rw, use_rw, n_s, -1, k + 2)
+        for i in range(k):
+            if np.isnan(smoothed[i + 1]):
+                smoothed[i + 1] = sub[i]
+        if np.isnan(smoothed[0]):
+            smoothed[0] = smoothed[1]
+        if np.isnan(smoothed[k + 1]):
+            smoothed[k + 1] = smoothed[k]
+        for i in range(k + 2):
+            c[j + i * period] = smoothed[i]
+    return c
+
+
+def _inner_loop(y, trend, rw, use_rw, period, n_s, n_l, n_t, n_inner):
+    """Run the six-step STL inner loop n_inner times; returns (trend, seasonal)."""
+    n = y.shape[0]
+    ones = np.ones(n)
+    seasonal = np.zeros(n)
+    for _ in range(n_inner):
+        # 1. Detrend; 2. cycle-subseries smoothing
+        c = _cycle_subseries(y - trend, rw, use_rw, period, n_s)
+        # 3. Low-pass filter of the smoothed cycle-subseries
+        low = _moving_average(_moving_average(_moving_average(c, period), period), 3)
+        low = _loess(low, ones, False, n_l, 0, n)
+        # 4. Detrend the smoothed cycle-subseries
+        seasonal = c[period:period + n] - low
+        # 5. Deseasonalize; 6. trend smoothing
+        deseasonalized = y - seasonal
+        trend = _loess(deseasonalized, rw, use_rw, n_t, 0, n)
+        trend = np.where(np.isnan(trend), deseasonalized, trend)
+    return trend, seasonal
+
+
+@njit(cache=True)
+def _robustness_weights(resid):
+    """Bisquare weights B(u) = (1 - u²)² with u = |r| / (6 * median|r|)."""
+    abs_r = np.abs(resid)
+    cmad = 6.0 * np.median(abs_r)
+    if cmad == 0.0:
+        # Exact fit (e.g. two observations per cycle-subseries): keep every point
+        return np.ones(resid.shape[0])
+    c9 = 0.999 * cmad
+    c1 = 0.001 * cmad
+    rw = np.empty(resid.shape[0])
+    for i in range(resid.shape[0]):
+        r = abs_r[i]
+        if r <= c1:
+            rw[i] = 1.0
+        elif r <= c9:
+            rw[i] = (1.0 - (r / cmad) ** 2) ** 2
+        else:
+            rw[i] = 0.0
+    return rw
+
+
+def _stl(y, period, n_s, n_l, n_t, n_inner, n_outer):
+    n = y.shape[0]
+    trend = np.zeros(n)
+    rw = np.ones(n)
+    trend, seasonal = _inner_loop(y, trend, rw, False, period, n_s, n_l, n_t, n_inner)
+    for _ in range(n_outer):
+        rw = _robustness_weights(y - trend - seasonal)
+        trend, seasonal = _inner_loop(y, trend, rw, True, period, n_s, n_l, n_t, n_inner)
+    return trend, seasonal
+
+
+def _next_odd(x: float) -> int:
+    x = int(np.ceil(x))
+    return x + 1 if x % 2 == 0 else x
+
+
+def stl(
+    y: np.ndarray,
+    period: int,
+    n_inner: int = 2,
+    n_outer: int = 1,
+    seasonal: int = 7,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Seasonal-Trend decomposition using LOESS.
+
+    Parameters
+    ----------
+    y : np.ndarray
+        Regular series without NaN, at least two periods long.
+    period : int
+        Seasonal period in number of observations (>= 2).
+    n_inner : int
+        Inner-loop passes per outer iteration.
+    n_outer : int
+        Robustness iterations (bisquare reweighting); 0 disables robustness.
+    seasonal : int
+        Seasonal smoother length (odd, >= 3).
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+        (trend, seasonal, resid)
+    """
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    n_s = _next_odd(seasonal)
+    # Same smoother lengths statsmodels derives from period and seasonal
+    n_l = _next_odd(period + 1)
+    n_t = _next_odd(1.5 * period / (1 - 1.5 / n_s))
+
+    trend, season = _stl(y, period, n_s, n_l, n_t, n_inner, n_outer)
+    return trend, season, y - trend - season
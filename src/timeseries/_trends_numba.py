@@ -0,0 +1,90 @@
+"""Numba kernels for pixel-wise Mann-Kendall / Sen's slope.
+
+Same statistics as ``trends.mann_kendall_test`` and ``trends.sens_slope``,
+compiled and parallelized over pixels with ``prange``. Importing this module
+requires ``numba``; ``trends.analyze_trend_stack`` imports it lazily.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True)
+def _mann_kendall(y):
+    """Return (tau, p_value) for a NaN-free series with at least 4 values."""
+    n = y.shape[0]
+    s = 0
+    for i in range(n - 1):
+        for j in range(i + 1, n):
+            diff = y[j] - y[i]
+            if diff > 0:
+                s += 1
+            elif diff < 0:
+                s -= 1
+    tau = s / (n * (n - 1) / 2)
+
+    # Variance of S corrected for runs of tied values
+    var_s = (n * (n - 1) * (2 * n + 5)) / 18
+    ordered = np.sort(y)
+    run = 1
+    for i in range(1, n + 1):
+        if i < n and ordered[i] == ordered[i - 1]:
+            run += 1
+        else:
+            if run > 1:
+                var_s -= run * (run - 1) * (2 * run + 5) / 18
+            run = 1
+
+    z = 0.0
+    if var_s > 0:
+        if s > 0:
+            z = (s - 1) / math.sqrt(var_s)
+        elif s < 0:
+            z = (s + 1) / math.sqrt(var_s)
+    p_value = math.erfc(abs(z) / math.sqrt(2.0))
+    return tau, p_value
+
+
+@njit(cache=True)
+def _sens_slope(t, y):
+    """Median of pairwise slopes for a NaN-free series with at least 3 values."""
+    n = y.shape[0]
+    slopes = np.empty(n * (n - 1) // 2)
+    k = 0
+    for i in range(n - 1):
+        for j in range(i + 1, n):
+            dt = t[j] - t[i]
+            if dt > 0:
+                slopes[k] = (y[j] - y[i]) / dt
+                k += 1
+    if k == 0:
+        return 0.0
+    return np.median(slopes[:k])
+
+
+@njit(parallel=True, cache=True)
+def trend_stack(t, values_2d):
+    """Mann-Kendall tau/p-value and Sen's slope for every row of values_2d.
+
+    Returns (tau, p_value, slope, n_obs), one entry per pixel.
+    """
+    n_pix = values_2d.shape[0]
+    tau = np.zeros(n_pix)
+    p_value = np.ones(n_pix)
+    slope = np.zeros(n_pix)
+    n_obs = np.zeros(n_pix, dtype=np.int64)
+    for p in prange(n_pix):
+        row = values_2d[p]
+        valid = ~np.isnan(row)
+        y = row[valid]
+        n = y.shape[0]
+        n_obs[p] = n
+        if n >= 4:
+            tau[p], p_value[p] = _mann_kendall(y)
+        if n >= 3:
+            slope[p] = _sens_slope(t[valid], y)
+    return tau, p_value, slope, n_obs
@@ -7,6 +7,7 @@ from typing import Optional
 import numpy as np
 import pandas as pd
 from loguru import logger
+from scipy import linalg
 
 
 def gap_fill_timeseries(
@@ -71,10 +72,31 @@ def gap_fill_timeseries(
     return regular.reset_index()
 
 
+# Below this many periods the robustness loop drives residuals to rounding
+# noise, so the bisquare weights (and the two STL implementations) diverge.
+_STL_NUMBA_MIN_PERIODS = 4
+
+
+def _resolve_stl_backend(backend: str, n_time: int, period: int) -> str:
+    """Pick the STL implementation for "auto"; validate explicit choices."""
+    if backend not in ("auto", "numba", "statsmodels"):
+        raise ValueError(f"Unknown STL backend: {backend!r}")
+    if backend != "auto":
+        return backend
+    if n_time < _STL_NUMBA_MIN_PERIODS * period:
+        return "statsmodels"
+    try:
+        import numba  # noqa: F401
+    except ImportError:
+        return "statsmodels"
+    return "numba"
+
+
 def stl_decomposition(
     df: pd.DataFrame,
     value_col: str = "mean",
     period: int = 73,  # ~365 days / 5-day interval
+    backend: str = "auto",
 ) -> dict[str, pd.Series]:
     """Apply STL (Seasonal-Trend decomposition using LOESS).
 
@@ -86,15 +108,22 @@ def stl_decomposition(
         Value column.
     period : int
         Seasonal period in number of observations.
+    backend : str
+        "numba" uses the in-tree JIT implementation (src/timeseries/_stl_numba.py),
+        "statsmodels" the statsmodels STL (robust, 2 inner / 15 outer
+        iterations in both). The two agree to ~1e-10 once the series spans at
+        least four periods; on shorter series the robustness weights are set
+        by rounding noise and results can differ by several hundredths.
+        "auto" picks numba only when it is installed and the series is long
+        enough, statsmodels otherwise.
 
     Returns
     -------
     dict
         Keys: "trend", "seasonal", "residual", each as pd.Series.
     """
-    from statsmodels.tsa.seasonal import STL
-
     series = df[value_col].dropna()
+    backend = _resolve_stl_backend(backend, len(series), period)
 
     if len(series) < 2 * period:
         logger.warning(
@@ -106,6 +135,18 @@ def stl_decomposition(
             "residual": pd.Series(0, index=series.index),
         }
 
+    if backend == "numba":
+        from src.timeseries._stl_numba import stl
+
+        trend, seasonal, resid = stl(series.values, period, n_inner=2, n_outer=15)
+        return {
+            "trend": pd.Series(trend, index=series.index, name="trend"),
+            "seasonal": pd.Series(seasonal, index=series.index, name="season"),
+            "residual": pd.Series(resid, index=series.index, name="resid"),
+        }
+
+    from statsmodels.tsa.seasonal import STL
+
     stl = STL(series, period=period, robust=True)
     result = stl.fit()
 
@@ -116,6 +157,81 @@ def stl_decomposition(
     }
 
 
+def stl_decomposition_batch(
+    values_2d: np.ndarray,
+    period: int = 73,
+    backend: str = "auto",
+) -> dict[str, np.ndarray]:
+    """Apply STL to a stack of pixel time series at once.
+
+    Parameters
+    ----------
+    values_2d : np.ndarray
+        Regular (gap-filled) series, shape (n_pixels, n_time).
+    period : int
+        Seasonal period in number of observations.
+    backend : str
+        Same choices as :func:`stl_decomposition`, resolved once for the
+        whole stack; "auto" runs the JIT STL on every row when it applies.
+
+    Returns
+    -------
+    dict
+        Keys: "trend", "seasonal", "residual", each of shape (n_pixels, n_time).
+    """
+    values_2d = np.asarray(values_2d, dtype=np.float64)
+    if values_2d.ndim != 2:
+        raise ValueError(f"values_2d must be 2-D (n_pixels, n_time), got {values_2d.shape}")
+
+    n_time = values_2d.shape[1]
+    backend = _resolve_stl_backend(backend, n_time, period)
+    if n_time < 2 * period:
+        logger.warning(
+            "Time series too short for STL ({} obs, need {})", n_time, 2 * period
+        )
+        return {
+            "trend": values_2d.copy(),
+            "seasonal": np.zeros_like(values_2d),
+            "residual": np.zeros_like(values_2d),
+        }
+
+    trend = np.empty_like(values_2d)
+    seasonal = np.empty_like(values_2d)
+    residual = np.empty_like(values_2d)
+
+    if backend == "numba":
+        from src.timeseries._stl_numba import stl
+
+        for i, series in enumerate(values_2d):
+            trend[i], seasonal[i], residual[i] = stl(series, period, n_inner=2, n_outer=15)
+        return {"trend": trend, "seasonal": seasonal, "residual": residual}
+
+    from statsmodels.tsa.seasonal import STL
+
+    for i, series in enumerate(values_2d):
+        result = STL(series, period=period, robust=True).fit()
+        trend[i] = result.trend
+        seasonal[i] = result.seasonal
+        residual[i] = result.resid
+
+    return {"trend": trend, "seasonal": seasonal, "residual": residual}
+
+
+def _harmonic_design_matrix(dates: pd.DatetimeIndex, n_harmonics: int) -> np.ndarray:
+    """Design matrix [1, cos(2πkt), sin(2πkt), ...] with t = day-of-year / 365.25.
+
+    Built in float32: index values are bounded in [-1, 1] with noise far above
+    float32 resolution, and it halves the bytes touched by every pass.
+    """
+    year_fraction = (dates.dayofyear.values / 365.25).astype(np.float32)
+
+    X = np.ones((len(dates), 1 + 2 * n_harmonics), dtype=np.float32)
+    for k in range(1, n_harmonics + 1):
+        X[:, 2 * k - 1] = np.cos(2 * np.pi * k * year_fraction)
+        X[:, 2 * k] = np.sin(2 * np.pi * k * year_fraction)
+    return X
+
+
 def harmonic_fit(
     dates: pd.DatetimeIndex,
     values: np.ndarray,
@@ -147,22 +263,14 @@ def harmonic_fit(
     dict
         Keys: "coefficients", "fitted", "residuals", "rmse"
     """
-    # Convert dates to fractional year
-    doy = dates.dayofyear.values
-    year_fraction = doy / 365.25
-
-    # Build design matrix
+    values = np.asarray(values, dtype=np.float64)
     n = len(dates)
-    X = np.ones((n, 1 + 2 * n_harmonics))
-
-    for k in range(1, n_harmonics + 1):
-        X[:, 2 * k - 1] = np.cos(2 * np.pi * k * year_fraction)
-        X[:, 2 * k] = np.sin(2 * np.pi * k * year_fraction)
+    X = _harmonic_design_matrix(dates, n_harmonics)
 
-    # Remove NaN observations
+    # Remove NaN observations; the solve runs in float32 like X
     valid = ~np.isnan(values)
     X_valid = X[valid]
-    y_valid = values[valid]
+    y_valid = values[valid].astype(np.float32)
 
     if len(y_valid) < X.shape[1]:
         logger.warning("Not enough valid observations for harmonic fit")
@@ -173,9 +281,16 @@ def harmonic_fit(
             "rmse": np.nan,
         }
 
-    # Least squares fit
-    coeffs, _, _, _ = np.linalg.lstsq(X_valid, y_valid, rcond=None)
+    # Least squares fit via the normal equations: X'X is at most a few columns
+    # wide, so a Cholesky solve is far cheaper than lstsq's SVD. Fall back to
+    # lstsq if X'X is singular (e.g. all observations on the same day of year).
+    try:
+        coeffs = linalg.solve(X_valid.T @ X_valid, X_valid.T @ y_valid, assume_a="pos")
+    except linalg.LinAlgError:
+        coeffs, _, _, _ = np.linalg.lstsq(X_valid, y_valid, rcond=None)
 
+    # Report in float64 so fitted/residuals are not rounded to float32
+    coeffs = coeffs.astype(np.float64)
     fitted = X @ coeffs
     residuals = values - fitted
     rmse = float(np.sqrt(np.nanmean(residuals**2)))
@@ -188,6 +303,68 @@ def harmonic_fit(
     }
 
 
+def harmonic_fit_stack(
+    dates: pd.DatetimeIndex,
+    values_2d: np.ndarray,
+    n_harmonics: int = 2,
+    time_batch: int = 512,
+) -> dict:
+    """Fit the harmonic model of ``harmonic_fit`` to a stack of pixel series.
+
+    The least-squares solution is shared by every pixel (same dates, same
+    design matrix), so it is computed once as a pseudo-inverse. Residuals are
+    then accumulated ``time_batch`` observations at a time, so peak memory is
+    (n_pixels × time_batch) instead of a full fitted/residual stack.
+
+    Parameters
+    ----------
+    dates : pd.DatetimeIndex
+        Observation dates shared by all pixels.
+    values_2d : np.ndarray
+        Gap-filled values, shape (n_pixels, n_time). NaN is not allowed.
+    n_harmonics : int
+        Number of harmonic terms (default 2).
+    time_batch : int
+        Observations per residual chunk; trades peak memory for per-chunk work.
+
+    Returns
+    -------
+    dict
+        Keys: "coefficients" (n_pixels, 1 + 2*n_harmonics), "rmse" (n_pixels,).
+    """
+    values_2d = np.asarray(values_2d, dtype=np.float32)
+    n = len(dates)
+    if values_2d.ndim != 2 or values_2d.shape[1] != n:
+        raise ValueError(
+            f"values_2d must have shape (n_pixels, {n}), got {values_2d.shape}"
+        )
+    if np.isnan(values_2d).any():
+        raise ValueError("values_2d contains NaN; gap-fill the series first")
+
+    X = _harmonic_design_matrix(dates, n_harmonics)
+    n_pixels = values_2d.shape[0]
+
+    if n < X.shape[1]:
+        logger.warning("Not enough observations for harmonic fit")
+        return {
+            "coefficients": np.zeros((n_pixels, X.shape[1]), dtype=np.float32),
+            "rmse": np.full(n_pixels, np.nan),
+        }
+
+    coeffs = values_2d @ np.linalg.pinv(X).T
+
+    sq_sum = np.zeros(n_pixels)
+    for t0 in range(0, n, time_batch):
+        t1 = t0 + time_batch
+        residuals = values_2d[:, t0:t1] - coeffs @ X[t0:t1].T
+        sq_sum += np.einsum("ij,ij->i", residuals, residuals)
+
+    return {
+        "coefficients": coeffs,
+        "rmse": np.sqrt(sq_sum / n),
+    }
+
+
 def detect_breaks_harmonic(
     dates: pd.DatetimeIndex,
     values: np.ndarray,
@@ -222,6 +399,7 @@ def detect_breaks_harmonic(
     list[dict]
         Detected breaks with keys: "date", "value", "expected", "anomaly".
     """
+    values = np.asarray(values, dtype=np.float64)
     history_mask = dates <= pd.Timestamp(history_end)
     monitor_mask = ~history_mask
 
@@ -237,13 +415,7 @@ def detect_breaks_harmonic(
     monitor_dates = dates[monitor_mask]
     monitor_values = values[monitor_mask]
 
-    doy = monitor_dates.dayofyear.values
-    year_fraction = doy / 365.25
-    n = len(monitor_dates)
-    X = np.ones((n, 1 + 2 * n_harmonics))
-    for k in range(1, n_harmonics + 1):
-        X[:, 2 * k - 1] = np.cos(2 * np.pi * k * year_fraction)
-        X[:, 2 * k] = np.sin(2 * np.pi * k * year_fraction)
+    X = _harmonic_design_matrix(monitor_dates, n_harmonics)
 
     expected = X @ fit["coefficients"]
     anomalies = monitor_values - expected
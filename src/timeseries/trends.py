@@ -8,6 +8,14 @@ from loguru import logger
 from scipy import stats
 
 
+def _fractional_years(dates: pd.DatetimeIndex) -> np.ndarray:
+    """Years elapsed since the first date, as float64."""
+    # Work on the raw int64 nanoseconds (cast explicitly: pandas >= 2 indexes
+    # may carry s/ms/us units).
+    ns = dates.values.astype("datetime64[ns]").view(np.int64)
+    return (ns - ns[0]).astype(np.float64) / (365.25 * 86400 * 1e9)
+
+
 def mann_kendall_test(values: np.ndarray) -> dict:
     """Perform the Mann-Kendall trend test.
 
@@ -50,14 +58,13 @@ def mann_kendall_test(values: np.ndarray) -> dict:
     # Kendall's tau
     tau = s / (n * (n - 1) / 2)
 
-    # Variance of S (corrected for ties)
-    unique, counts = np.unique(clean, return_counts=True)
-    tied_groups = counts[counts > 1]
-
+    # Variance of S (corrected for ties). Ties are rare on continuous index
+    # values, so check with an O(n) hash before paying for the sort in unique.
     var_s = (n * (n - 1) * (2 * n + 5)) / 18
-    if len(tied_groups) > 0:
-        for t in tied_groups:
-            var_s -= t * (t - 1) * (2 * t + 5) / 18
+    if pd.Series(clean).duplicated().any():
+        _, counts = np.unique(clean, return_counts=True)
+        tied = counts[counts > 1]
+        var_s -= (tied * (tied - 1) * (2 * tied + 5)).sum() / 18
 
     # Z-score
     if s > 0:
@@ -104,6 +111,7 @@ def sens_slope(dates: pd.DatetimeIndex, values: np.ndarray) -> dict:
         Keys: "slope" (per year), "intercept", "lower_ci", "upper_ci"
         (95% confidence interval for slope).
     """
+    values = np.asarray(values, dtype=np.float64)
     valid = ~np.isnan(values)
     clean_dates = dates[valid]
     clean_values = values[valid]
@@ -117,11 +125,7 @@ def sens_slope(dates: pd.DatetimeIndex, values: np.ndarray) -> dict:
             "upper_ci": 0.0,
         }
 
-    # Convert dates to fractional years
-    t = np.array([
-        (d - clean_dates[0]).total_seconds() / (365.25 * 86400)
-        for d in clean_dates
-    ])
+    t = _fractional_years(clean_dates)
 
     # Compute all pairwise slopes
     slopes = []
@@ -209,3 +213,42 @@ def analyze_trend(
     )
 
     return result
+
+
+def analyze_trend_stack(dates: pd.DatetimeIndex, values_2d: np.ndarray) -> dict:
+    """Mann-Kendall and Sen's slope for every pixel series of a stack.
+
+    Same statistics as ``mann_kendall_test`` / ``sens_slope``, computed by
+    Numba kernels (src/timeseries/_trends_numba.py) that run pixels in
+    parallel across all cores.
+
+    Parameters
+    ----------
+    dates : pd.DatetimeIndex
+        Observation dates shared by all pixels.
+    values_2d : np.ndarray
+        Values of shape (n_pixels, n_time); NaN allowed per pixel.
+
+    Returns
+    -------
+    dict
+        Per-pixel arrays: "tau", "p_value", "significant" (α=0.05),
+        "slope" (per year) and "n" (valid observations).
+    """
+    from src.timeseries._trends_numba import trend_stack
+
+    values_2d = np.asarray(values_2d, dtype=np.float64)
+    if values_2d.ndim != 2 or values_2d.shape[1] != len(dates):
+        raise ValueError(
+            f"values_2d must have shape (n_pixels, {len(dates)}), got {values_2d.shape}"
+        )
+
+    tau, p_value, slope, n_obs = trend_stack(_fractional_years(dates), values_2d)
+
+    return {
+        "tau": tau,
+        "p_value": p_value,
+        "significant": (p_value < 0.05) & (n_obs >= 4),
+        "slope": slope,
+        "n": n_obs,
+    }
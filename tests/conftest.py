@@ -0,0 +1,36 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+from config.settings import TARGET_CRS
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "gpu: needs CuPy and a CUDA device")
+
+
+@pytest.fixture(scope="session")
+def utm_crs():
+    """Project target CRS as a pyproj CRS, resolved from the PROJ database once."""
+    from pyproj import CRS
+
+    return CRS.from_user_input(TARGET_CRS)
+
+
+@pytest.fixture(scope="session")
+def sample_aoi_files(tmp_path_factory):
+    """A small AOI box (WGS84) written once as GeoJSON and GeoPackage.
+
+    Returns the directory containing ``aoi.geojson`` and ``aoi.gpkg``.
+    """
+    import geopandas as gpd
+    from shapely.geometry import box
+
+    path = tmp_path_factory.mktemp("aoi_files")
+    gdf = gpd.GeoDataFrame(
+        [{"geometry": box(-39.5, -7.5, -39.0, -7.0), "name": "test"}],
+        crs="EPSG:4326",
+    )
+    gdf.to_file(str(path / "aoi.geojson"), driver="GeoJSON")
+    gdf.to_file(str(path / "aoi.gpkg"), driver="GPKG")
+    return path
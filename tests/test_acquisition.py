@@ -4,6 +4,7 @@ These tests verify the query logic without making real HTTP requests.
 Integration tests that hit actual STAC APIs should be run separately.
 """
 
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -11,6 +12,7 @@ import pytest
 from config.settings import AOI_BBOX, ELEMENT84_URL, SENTINEL2_COLLECTION
 from src.acquisition.stac_client import (
     _build_datetime_range,
+    _catalog,
     search_element84,
     search_sentinel2_with_fallback,
 )
@@ -31,10 +33,10 @@ class TestDatetimeRange:
 
 
 class TestSearchElement84:
-    @patch("src.acquisition.stac_client.Client")
-    def test_returns_items(self, mock_client_class):
+    @patch("src.acquisition.stac_client._catalog")
+    def test_returns_items(self, mock_open_catalog):
         mock_catalog = MagicMock()
-        mock_client_class.open.return_value = mock_catalog
+        mock_open_catalog.return_value = mock_catalog
 
         mock_search = MagicMock()
         mock_items = MagicMock()
@@ -47,14 +49,14 @@ class TestSearchElement84:
             datetime_range="2024-01-01/2024-06-30",
         )
 
-        mock_client_class.open.assert_called_once_with(ELEMENT84_URL)
+        mock_open_catalog.assert_called_once_with(ELEMENT84_URL)
         mock_catalog.search.assert_called_once()
         assert result == mock_items
 
-    @patch("src.acquisition.stac_client.Client")
-    def test_passes_cloud_filter(self, mock_client_class):
+    @patch("src.acquisition.stac_client._catalog")
+    def test_passes_cloud_filter(self, mock_open_catalog):
         mock_catalog = MagicMock()
-        mock_client_class.open.return_value = mock_catalog
+        mock_open_catalog.return_value = mock_catalog
 
         mock_search = MagicMock()
         mock_search.item_collection.return_value = MagicMock(__len__=MagicMock(return_value=0))
@@ -70,6 +72,20 @@ class TestSearchElement84:
         assert call_kwargs["query"]["eo:cloud_cover"]["lt"] == 15
 
 
+class TestCatalogCache:
+    @patch("src.acquisition.stac_client.Client")
+    def test_opens_each_url_once(self, mock_client_class):
+        _catalog.cache_clear()
+        try:
+            first = _catalog(ELEMENT84_URL)
+            second = _catalog(ELEMENT84_URL)
+        finally:
+            _catalog.cache_clear()
+
+        assert first is second
+        mock_client_class.open.assert_called_once_with(ELEMENT84_URL, modifier=None)
+
+
 class TestFallback:
     @patch("src.acquisition.stac_client.search_planetary_computer")
     @patch("src.acquisition.stac_client.search_element84")
@@ -100,3 +116,109 @@ class TestFallback:
         mock_e84.assert_called_once()
         mock_pc.assert_not_called()
         assert result == mock_e84_items
+
+
+def _items(n):
+    items = MagicMock()
+    items.__len__ = MagicMock(return_value=n)
+    return items
+
+
+class TestHedgedSearch:
+    @patch("src.acquisition.stac_client.search_planetary_computer")
+    @patch("src.acquisition.stac_client.search_element84")
+    def test_element84_preferred_over_faster_pc(self, mock_e84, mock_pc):
+        def slow_e84(**kwargs):
+            time.sleep(0.1)
+            return _items(5)
+
+        mock_e84.side_effect = slow_e84
+        mock_pc.return_value = _items(3)
+
+        result = search_sentinel2_with_fallback(hedge=True, hedge_delay=1.0)
+
+        assert len(result) == 5
+
+    @patch("src.acquisition.stac_client.search_planetary_computer")
+    @patch("src.acquisition.stac_client.search_element84")
+    def test_falls_back_to_pc_when_empty(self, mock_e84, mock_pc):
+        mock_e84.return_value = _items(0)
+        mock_pc.return_value = _items(3)
+
+        result = search_sentinel2_with_fallback(hedge=True, hedge_delay=1.0)
+
+        assert result == mock_pc.return_value
+        mock_pc.assert_called_once()
+
+    @patch("src.acquisition.stac_client.search_planetary_computer")
+    @patch("src.acquisition.stac_client.search_element84")
+    def test_fallback_latency_is_max_not_sum(self, mock_e84, mock_pc):
+        def delayed(n):
+            def search(**kwargs):
+                time.sleep(0.3)
+                return _items(n)
+            return search
+
+        mock_e84.side_effect = delayed(0)
+        mock_pc.side_effect = delayed(3)
+
+        start = time.perf_counter()
+        result = search_sentinel2_with_fallback(hedge=True, hedge_delay=1.0)
+        elapsed = time.perf_counter() - start
+
+        assert len(result) == 3
+        assert elapsed < 0.5
+
+    @patch("src.acquisition.stac_client.search_planetary_computer")
+    @patch("src.acquisition.stac_client.search_element84")
+    def test_fast_element84_error_falls_back_to_pc(self, mock_e84, mock_pc):
+        mock_e84.side_effect = RuntimeError("E84 down")
+        mock_pc.return_value = _items(3)
+
+        result = search_sentinel2_with_fallback(hedge=True, hedge_delay=1.0)
+
+        assert result == mock_pc.return_value
+
+    @patch("src.acquisition.stac_client.search_planetary_computer")
+    @patch("src.acquisition.stac_client.search_element84")
+    def test_slow_element84_hedges_to_pc(self, mock_e84, mock_pc):
+        def slow_e84(**kwargs):
+            time.sleep(0.5)
+            return _items(5)
+
+        mock_e84.side_effect = slow_e84
+        mock_pc.return_value = _items(3)
+
+        result = search_sentinel2_with_fallback(hedge=True, hedge_delay=0.01)
+
+        assert result == mock_pc.return_value
+        mock_pc.assert_called_once()
+
+    @patch("src.acquisition.stac_client.search_planetary_computer")
+    @patch("src.acquisition.stac_client.search_element84")
+    def test_pc_error_does_not_hide_element84(self, mock_e84, mock_pc):
+        e84_items = _items(5)
+
+        def slow_e84(**kwargs):
+            time.sleep(0.1)
+            return e84_items
+
+        mock_e84.side_effect = slow_e84
+        mock_pc.side_effect = RuntimeError("PC down")
+
+        result = search_sentinel2_with_fallback(hedge=True, hedge_delay=0.01)
+
+        assert result is e84_items
+
+    @patch("src.acquisition.stac_client.search_planetary_computer")
+    @patch("src.acquisition.stac_client.search_element84")
+    def test_raises_when_both_fail(self, mock_e84, mock_pc):
+        def slow_fail(**kwargs):
+            time.sleep(0.05)
+            raise RuntimeError("E84 down")
+
+        mock_e84.side_effect = slow_fail
+        mock_pc.side_effect = RuntimeError("PC down")
+
+        with pytest.raises(RuntimeError):
+            search_sentinel2_with_fallback(hedge=True, hedge_delay=0.01)
@@ -11,52 +11,34 @@ from src.acquisition.aoi import (
 )
 
 
+@pytest.fixture(scope="module")
+def fallback_aoi(tmp_path_factory):
+    """AOI loaded from a missing file (bbox fallback), reprojected once per module."""
+    missing = tmp_path_factory.mktemp("aoi") / "nonexistent.gpkg"
+    return load_aoi_polygon(path=missing, target_crs="EPSG:32724")
+
+
 class TestLoadAoiPolygon:
-    def test_fallback_to_bbox_when_no_file(self, tmp_path):
+    def test_fallback_to_bbox_when_no_file(self, fallback_aoi):
         """When the polygon file doesn't exist, should return a rectangle from AOI_BBOX."""
-        gdf = load_aoi_polygon(path=tmp_path / "nonexistent.gpkg")
-        assert len(gdf) == 1
-        assert gdf.crs is not None
+        assert len(fallback_aoi) == 1
+        assert fallback_aoi.crs is not None
 
-    def test_reprojects_to_target_crs(self, tmp_path):
+    def test_reprojects_to_target_crs(self, fallback_aoi, utm_crs):
         """Polygon should be reprojected to the requested CRS."""
-        gdf = load_aoi_polygon(
-            path=tmp_path / "nonexistent.gpkg",
-            target_crs="EPSG:32724",
-        )
-        assert "32724" in str(gdf.crs)
+        assert fallback_aoi.crs == utm_crs
 
-    def test_loads_existing_geojson(self, tmp_path):
+    def test_loads_existing_geojson(self, sample_aoi_files, utm_crs):
         """Should load a real GeoJSON file when it exists."""
-        import geopandas as gpd
-        from shapely.geometry import box
-
-        geojson_path = tmp_path / "test_aoi.geojson"
-        test_gdf = gpd.GeoDataFrame(
-            [{"geometry": box(-39.5, -7.5, -39.0, -7.0), "name": "test"}],
-            crs="EPSG:4326",
-        )
-        test_gdf.to_file(str(geojson_path), driver="GeoJSON")
-
-        gdf = load_aoi_polygon(path=geojson_path, target_crs="EPSG:32724")
+        gdf = load_aoi_polygon(path=sample_aoi_files / "aoi.geojson", target_crs="EPSG:32724")
         assert len(gdf) == 1
-        assert "32724" in str(gdf.crs)
+        assert gdf.crs == utm_crs
 
-    def test_loads_geopackage(self, tmp_path):
+    def test_loads_geopackage(self, sample_aoi_files, utm_crs):
         """Should load a GeoPackage file when it exists."""
-        import geopandas as gpd
-        from shapely.geometry import box
-
-        gpkg_path = tmp_path / "test_aoi.gpkg"
-        test_gdf = gpd.GeoDataFrame(
-            [{"geometry": box(-39.5, -7.5, -39.0, -7.0), "name": "test"}],
-            crs="EPSG:4326",
-        )
-        test_gdf.to_file(str(gpkg_path), driver="GPKG")
-
-        gdf = load_aoi_polygon(path=gpkg_path, target_crs="EPSG:32724")
+        gdf = load_aoi_polygon(path=sample_aoi_files / "aoi.gpkg", target_crs="EPSG:32724")
         assert len(gdf) == 1
-        assert "32724" in str(gdf.crs)
+        assert gdf.crs == utm_crs
 
 
 class TestGetAoiBboxWgs84:
@@ -67,19 +49,9 @@ class TestGetAoiBboxWgs84:
         assert bbox[0] < bbox[2]  # west < east
         assert bbox[1] < bbox[3]  # south < north
 
-    def test_bbox_from_existing_file(self, tmp_path):
+    def test_bbox_from_existing_file(self, sample_aoi_files):
         """Should extract bbox from the polygon file."""
-        import geopandas as gpd
-        from shapely.geometry import box
-
-        geojson_path = tmp_path / "test_aoi.geojson"
-        test_gdf = gpd.GeoDataFrame(
-            [{"geometry": box(-39.5, -7.5, -39.0, -7.0)}],
-            crs="EPSG:4326",
-        )
-        test_gdf.to_file(str(geojson_path), driver="GeoJSON")
-
-        bbox = get_aoi_bbox_wgs84(path=geojson_path)
+        bbox = get_aoi_bbox_wgs84(path=sample_aoi_files / "aoi.geojson")
         assert abs(bbox[0] - (-39.5)) < 0.01
         assert abs(bbox[1] - (-7.5)) < 0.01
         assert abs(bbox[2] - (-39.0)) < 0.01
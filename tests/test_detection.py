@@ -1,5 +1,10 @@
 """Tests for change detection and alert generation."""
 
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
 import numpy as np
 import pytest
 import xarray as xr
@@ -63,6 +68,93 @@ class TestDelta:
         np.testing.assert_almost_equal(d.values[0, 0], -0.2)
 
 
+class TestNumbaKernels:
+    """Scene-sized inputs take the fused Numba path; it must match xarray."""
+
+    @pytest.fixture(autouse=True)
+    def _force_numba_path(self, monkeypatch):
+        pytest.importorskip("numba")
+        import src.detection.baseline as baseline
+
+        monkeypatch.setattr(baseline, "_NUMBA_MIN_SIZE", 0)
+
+    def test_zscore_matches_xarray(self):
+        current = _make_array([[0.3, np.nan, 0.7]] * 3)
+        mean = _make_array([[0.5, 0.5, 0.5]] * 3)
+        std = _make_array([[0.1, 0.001, np.nan]] * 3)
+
+        z = compute_zscore(current, mean, std, min_std=0.01)
+
+        expected = (current - mean) / std.where(std > 0.01, other=0.01)
+        np.testing.assert_allclose(z.values, expected.values)
+        assert z.name == "zscore"
+        assert z.dims == ("y", "x")
+
+    def test_delta_matches_xarray(self):
+        current = _make_array([[0.3, 0.4, 0.7]] * 3)
+        mean = _make_array([[0.5, 0.5, 0.5]] * 3)
+
+        d = compute_delta(current, mean)
+        np.testing.assert_allclose(d.values, (current - mean).values)
+        assert d.name == "delta"
+
+    def test_misaligned_grids_inner_join_like_xarray(self):
+        coords = {"y": [0, 1, 2], "x": [10, 20, 30]}
+        current = _make_array([[0.3, 0.4, 0.7]] * 3).assign_coords(coords)
+        current.attrs["units"] = "1"
+        mean = _make_array([[0.5, 0.5, 0.5]] * 3).assign_coords(
+            y=[0, 1, 2], x=[20, 30, 40]
+        )
+        std = _make_array([[0.1, 0.2, 0.3]] * 3).assign_coords(
+            y=[1, 2, 3], x=[20, 30, 40]
+        )
+
+        z = compute_zscore(current, mean, std, min_std=0.01)
+        expected = (current - mean) / std.where(std > 0.01, other=0.01)
+        xr.testing.assert_allclose(z.rename(None), expected)
+        assert z.attrs == expected.attrs
+
+        d = compute_delta(current, mean)
+        expected = current - mean
+        xr.testing.assert_allclose(d.rename(None), expected)
+        assert d.attrs == expected.attrs
+
+    def test_dask_input_matches_numpy(self):
+        pytest.importorskip("dask")
+        current = _make_array([[0.3, 0.4, 0.7]] * 3)
+        mean = _make_array([[0.5, 0.5, 0.5]] * 3)
+        std = _make_array([[0.1, 0.2, 0.3]] * 3)
+
+        z = compute_zscore(current.chunk({"x": 2}), mean, std)
+
+        assert z.chunks is not None
+        np.testing.assert_allclose(z.values, compute_zscore(current, mean, std).values)
+
+    def test_dask_input_lets_the_interpreter_exit(self):
+        """Parallel Numba kernels in dask worker threads hung at exit (TBB)."""
+        pytest.importorskip("dask")
+        script = textwrap.dedent(
+            """
+            import numpy as np
+            import xarray as xr
+            import src.detection.baseline as baseline
+
+            baseline._NUMBA_MIN_SIZE = 0
+            cur = xr.DataArray(np.random.rand(40, 40), dims=("y", "x"))
+            z = baseline.compute_zscore(
+                cur.chunk({"x": 20, "y": 20}), xr.zeros_like(cur), xr.ones_like(cur)
+            )
+            z.values
+            """
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=Path(__file__).resolve().parents[1],
+            timeout=60,
+        )
+        assert result.returncode == 0
+
+
 class TestDetectDeforestation:
     def test_high_confidence_detection(self):
         """Pixels with extreme anomalies in both NDMI and NBR → high confidence."""
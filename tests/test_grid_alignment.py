@@ -109,13 +109,15 @@ class TestGridAlignment:
             coords={"y": y_ref, "x": x_ref},
         )
 
-        # 5 spectral bands with various sub-pixel offsets
+        # 5 spectral bands: the 10m bands share one sub-pixel offset, the 20m
+        # bands another (one grid per native resolution after reprojection)
+        rng = np.random.default_rng(0)
         bands = {}
         bands["scl"] = scl
-        for i, name in enumerate(["nir", "nir08", "red", "swir16", "swir22"]):
-            offset = (i + 1) * 0.01  # increasingly different offsets
+        offsets = {"nir": 0.01, "red": 0.01, "nir08": 0.02, "swir16": 0.02, "swir22": 0.02}
+        for name, offset in offsets.items():
             bands[name] = xr.DataArray(
-                np.random.rand(5, 5),
+                rng.random((5, 5)),
                 dims=["y", "x"],
                 coords={
                     "y": y_ref + offset,
@@ -123,14 +125,15 @@ class TestGridAlignment:
                 },
             )
 
-        # Apply the same alignment logic as load_bands()
-        ref_name = "scl"
-        ref = bands[ref_name]
-        for name in list(bands.keys()):
-            if name != ref_name:
-                bands[name] = bands[name].reindex_like(
-                    ref, method="nearest", tolerance=20.0,
-                )
+        # Apply the alignment used by load_bands()
+        from src.acquisition.download import align_to_reference
+
+        originals = {name: bands[name].values for name in offsets}
+        bands = align_to_reference(bands, "scl", tolerance=20.0)
+
+        for name, values in originals.items():
+            np.testing.assert_array_equal(bands[name].coords["y"].values, y_ref)
+            np.testing.assert_array_equal(bands[name].values, values)
 
         # Create dataset and apply mask
         ds = xr.Dataset(bands)
@@ -164,15 +167,69 @@ class TestCloudMaskAfterAlignment:
         )
 
         # Replicate mask_sentinel2 logic
-        from src.processing.cloud_mask import S2_CLEAR_CLASSES
+        from src.processing.cloud_mask import _scl_clear
 
         scl = ds["scl"]
-        clear_mask = xr.zeros_like(scl, dtype=bool)
-        for cls in S2_CLEAR_CLASSES:
-            clear_mask = clear_mask | (scl == cls)
+        clear_mask = xr.DataArray(_scl_clear(scl.values), dims=scl.dims, coords=scl.coords)
 
         masked = ds.drop_vars("scl").where(clear_mask)
 
         # 7 of 9 pixels should survive
         n_valid = int(masked["nir08"].notnull().sum())
         assert n_valid == 7, f"Expected 7 clear pixels, got {n_valid}"
+
+    def test_mask_sentinel2_keeps_only_clear_classes(self):
+        """mask_sentinel2 should NaN exactly the non-clear SCL classes."""
+        from src.processing.cloud_mask import S2_CLEAR_CLASSES, mask_sentinel2
+
+        scl = np.arange(12, dtype=np.uint8).reshape(3, 4)
+        ds = xr.Dataset(
+            {
+                "nir08": xr.DataArray(np.full((3, 4), 0.5), dims=["y", "x"]),
+                "scl": xr.DataArray(scl, dims=["y", "x"]),
+            }
+        )
+
+        masked = mask_sentinel2(ds)
+
+        assert "scl" not in masked
+        expected = np.isin(scl, list(S2_CLEAR_CLASSES))
+        np.testing.assert_array_equal(masked["nir08"].notnull().values, expected)
+
+    def test_lut_handles_float_scl_with_nan(self):
+        """load_band returns SCL as float32; NaN codes must read as not clear."""
+        from src.processing.cloud_mask import _scl_clear
+
+        scl = np.array([[4.0, np.nan], [8.0, 11.0]], dtype=np.float32)
+        np.testing.assert_array_equal(_scl_clear(scl), [[True, False], [False, True]])
+
+    def test_lut_treats_fractional_scl_as_no_data(self):
+        """Resampled SCL codes such as 4.5 must not truncate to a clear class."""
+        from src.processing.cloud_mask import _scl_clear
+
+        scl = np.array([4.0, 4.5, 5.9, 7.0], dtype=np.float32)
+        np.testing.assert_array_equal(_scl_clear(scl), [True, False, False, True])
+
+    def test_mask_sentinel2_stays_lazy_on_chunked_input(self):
+        """Dask-chunked bands should come back chunked, with the same result."""
+        dask = pytest.importorskip("dask")
+        from src.processing.cloud_mask import mask_sentinel2
+
+        def _no_compute(*args, **kwargs):
+            raise AssertionError("mask_sentinel2 computed a dask graph")
+
+        scl = np.tile(np.arange(12, dtype=np.float32), (8, 1))
+        ds = xr.Dataset(
+            {
+                "nir08": xr.DataArray(np.full(scl.shape, 0.5), dims=["y", "x"]),
+                "scl": xr.DataArray(scl, dims=["y", "x"]),
+            }
+        )
+
+        with dask.config.set(scheduler=_no_compute):
+            masked = mask_sentinel2(ds.chunk({"x": 4, "y": 4}))
+
+        assert masked["nir08"].chunks is not None
+        np.testing.assert_array_equal(
+            masked["nir08"].notnull().values, mask_sentinel2(ds)["nir08"].notnull().values
+        )
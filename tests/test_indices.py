@@ -1,5 +1,7 @@
 """Tests for vegetation index computation."""
 
+import math
+
 import numpy as np
 import pytest
 import xarray as xr
@@ -16,141 +18,121 @@ from src.processing.indices import (
 )
 
 
-def _make_dataset(**bands) -> xr.Dataset:
-    """Create a simple 3x3 test dataset from band arrays."""
-    data_vars = {}
-    for name, values in bands.items():
-        data_vars[name] = xr.DataArray(
-            np.array(values, dtype=np.float64).reshape(3, 3),
-            dims=["y", "x"],
-        )
-    return xr.Dataset(data_vars)
+def _make_bands(dtype=np.float32, **bands) -> dict[str, np.ndarray]:
+    """Create 3x3 band arrays from band values.
 
+    Each band is a scalar, a row of 3 values repeated down the rows, or a
+    full 3x3 array, broadcast (not copied) to 3x3. Bands default to
+    float32, as loaded by ``download.load_band``.
+    """
+    return {
+        name: np.broadcast_to(np.asarray(values, dtype=dtype), (3, 3))
+        for name, values in bands.items()
+    }
 
-class TestNDVI:
-    def test_basic(self):
-        ds = _make_dataset(
-            nir=[[0.4, 0.5, 0.6]] * 3,
-            red=[[0.1, 0.1, 0.1]] * 3,
-        )
-        result = ndvi(ds)
-        # NDVI = (0.4-0.1)/(0.4+0.1) = 0.6 for first pixel
-        np.testing.assert_almost_equal(result.values[0, 0], 0.6)
 
-    def test_range(self):
-        ds = _make_dataset(
-            nir=[[0.0, 0.5, 1.0]] * 3,
-            red=[[0.5, 0.5, 0.0]] * 3,
-        )
-        result = ndvi(ds)
-        assert result.values.min() >= -1.0
-        assert result.values.max() <= 1.0
+def _make_dataset(dtype=np.float32, **bands) -> xr.Dataset:
+    """Same bands as ``_make_bands``, wrapped in a 3x3 xr.Dataset."""
+    return xr.Dataset(
+        {name: (("y", "x"), arr) for name, arr in _make_bands(dtype, **bands).items()}
+    )
 
-    def test_zero_division(self):
-        ds = _make_dataset(
-            nir=[[0.0, 0.5, 0.3]] * 3,
-            red=[[0.0, 0.1, 0.1]] * 3,
-        )
-        result = ndvi(ds)
-        assert np.isnan(result.values[0, 0])  # 0/0 → NaN
 
-    def test_name(self):
-        ds = _make_dataset(nir=[[0.5, 0.5, 0.5]] * 3, red=[[0.1, 0.1, 0.1]] * 3)
-        result = ndvi(ds)
-        assert result.name == "ndvi"
+# Every band the index functions read; nir/nir08 vary across x
+_BANDS = dict(
+    nir=[0.4, 0.5, 0.6],
+    nir08=[0.4, 0.5, 0.6],
+    red=0.1,
+    blue=0.1,
+    swir16=0.2,
+    swir22=0.1,
+)
 
+# (index function, closed-form formula over one pixel's band values)
+CASES = [
+    (ndvi, lambda b: (b["nir"] - b["red"]) / (b["nir"] + b["red"])),
+    (ndmi, lambda b: (b["nir08"] - b["swir16"]) / (b["nir08"] + b["swir16"])),
+    (nbr, lambda b: (b["nir08"] - b["swir22"]) / (b["nir08"] + b["swir22"])),
+    (evi2, lambda b: 2.5 * (b["nir"] - b["red"]) / (b["nir"] + 2.4 * b["red"] + 1)),
+    (savi, lambda b: 1.5 * (b["nir"] - b["red"]) / (b["nir"] + b["red"] + 0.5)),
+    (
+        bsi,
+        lambda b: ((b["swir16"] + b["red"]) - (b["nir"] + b["blue"]))
+        / ((b["swir16"] + b["red"]) + (b["nir"] + b["blue"])),
+    ),
+]
 
-class TestNDMI:
-    def test_basic(self):
-        ds = _make_dataset(
-            nir08=[[0.4, 0.5, 0.6]] * 3,
-            swir16=[[0.2, 0.2, 0.2]] * 3,
-        )
-        result = ndmi(ds)
-        # NDMI = (0.4-0.2)/(0.4+0.2) = 0.333...
-        np.testing.assert_almost_equal(result.values[0, 0], 1 / 3)
 
-    def test_name(self):
-        ds = _make_dataset(nir08=[[0.5, 0.5, 0.5]] * 3, swir16=[[0.1, 0.1, 0.1]] * 3)
-        result = ndmi(ds)
-        assert result.name == "ndmi"
+@pytest.fixture(scope="session")
+def bands_ds() -> xr.Dataset:
+    """One 3x3 dataset with every band the index functions read."""
+    return _make_dataset(**_BANDS)
 
 
-class TestNBR:
-    def test_basic(self):
-        ds = _make_dataset(
-            nir08=[[0.5, 0.5, 0.5]] * 3,
-            swir22=[[0.1, 0.1, 0.1]] * 3,
-        )
-        result = nbr(ds)
-        expected = (0.5 - 0.1) / (0.5 + 0.1)
-        np.testing.assert_almost_equal(result.values[0, 0], expected)
+_CASE_IDS = [fn.__name__ for fn, _ in CASES]
 
 
-class TestEVI2:
-    def test_basic(self):
-        ds = _make_dataset(
-            nir=[[0.5, 0.5, 0.5]] * 3,
-            red=[[0.1, 0.1, 0.1]] * 3,
-        )
-        result = evi2(ds)
-        expected = 2.5 * (0.5 - 0.1) / (0.5 + 2.4 * 0.1 + 1)
-        np.testing.assert_almost_equal(result.values[0, 0], expected)
+@pytest.mark.parametrize("fn, formula", CASES, ids=_CASE_IDS)
+def test_index_basic(fn, formula):
+    # Only the numbers are checked here, so skip Dataset construction
+    result = fn(_make_bands(**_BANDS))
+    pixel = {name: float(np.ravel(v)[0]) for name, v in _BANDS.items()}
+    expected = formula(pixel)
+    # float32 bands: a few ulps (~6e-8 each near 0.5) of rounding headroom
+    value = float(result[0, 0])
+    assert math.isclose(value, expected, abs_tol=1e-6), f"{value} != {expected}"
+
 
+@pytest.mark.parametrize("fn", [fn for fn, _ in CASES], ids=_CASE_IDS)
+def test_index_name(bands_ds, fn):
+    result = fn(bands_ds)
+    assert isinstance(result, xr.DataArray)
+    assert result.name == fn.__name__
 
-class TestSAVI:
-    def test_basic(self):
+
+class TestNDVI:
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    def test_range(self, dtype):
         ds = _make_dataset(
-            nir=[[0.5, 0.5, 0.5]] * 3,
-            red=[[0.1, 0.1, 0.1]] * 3,
+            dtype=dtype,
+            nir=[0.0, 0.5, 1.0],
+            red=[0.5, 0.5, 0.0],
         )
-        result = savi(ds)
-        expected = 1.5 * (0.5 - 0.1) / (0.5 + 0.1 + 0.5)
-        np.testing.assert_almost_equal(result.values[0, 0], expected)
-
+        result = ndvi(ds)
+        assert result.values.min() >= -1.0
+        assert result.values.max() <= 1.0
 
-class TestBSI:
-    def test_basic(self):
+    def test_zero_division(self):
         ds = _make_dataset(
-            blue=[[0.1, 0.1, 0.1]] * 3,
-            red=[[0.2, 0.2, 0.2]] * 3,
-            nir=[[0.4, 0.4, 0.4]] * 3,
-            swir16=[[0.3, 0.3, 0.3]] * 3,
+            nir=[0.0, 0.5, 0.3],
+            red=[0.0, 0.1, 0.1],
         )
-        result = bsi(ds)
-        num = (0.3 + 0.2) - (0.4 + 0.1)
-        den = (0.3 + 0.2) + (0.4 + 0.1)
-        np.testing.assert_almost_equal(result.values[0, 0], num / den)
+        result = ndvi(ds)
+        assert np.isnan(result.values[0, 0])  # 0/0 → NaN
 
 
 class TestComputeIndex:
-    def test_dispatch_sentinel2(self):
-        ds = _make_dataset(
-            nir=[[0.5, 0.5, 0.5]] * 3,
-            red=[[0.1, 0.1, 0.1]] * 3,
-        )
-        result = compute_index(ds, "ndvi", sensor="sentinel2")
+    @pytest.mark.parametrize(
+        "sensor, band_name", [("sentinel2", "nir"), ("landsat", "nir08")]
+    )
+    def test_dispatch(self, bands_ds, sensor, band_name):
+        # Subsetting the shared dataset is a view; no new arrays are built
+        ds = bands_ds[[band_name, "red"]]
+        result = compute_index(ds, "ndvi", sensor=sensor)
         assert result.name == "ndvi"
 
-    def test_dispatch_landsat(self):
-        ds = _make_dataset(
-            nir08=[[0.5, 0.5, 0.5]] * 3,
-            red=[[0.1, 0.1, 0.1]] * 3,
-        )
-        result = compute_index(ds, "ndvi", sensor="landsat")
+    @pytest.mark.parametrize(
+        "sensor, renames",
+        [("sentinel2", {}), ("landsat", {"nir": "nir08"}), ("hls", {"nir": "nir08"})],
+    )
+    def test_sensors_agree(self, bands_ds, sensor, renames):
+        """Every sensor's band naming should give the same NDVI."""
+        expected = ndvi(bands_ds[["nir", "red"]])
+        ds = bands_ds[["nir", "red"]].rename(renames)
+        result = compute_index(ds, "ndvi", sensor=sensor)
+        np.testing.assert_allclose(result.values, expected.values)
         assert result.name == "ndvi"
 
-    def test_compute_all(self):
-        ds = _make_dataset(
-            nir=[[0.5, 0.5, 0.5]] * 3,
-            nir08=[[0.5, 0.5, 0.5]] * 3,
-            red=[[0.1, 0.1, 0.1]] * 3,
-            blue=[[0.05, 0.05, 0.05]] * 3,
-            swir16=[[0.2, 0.2, 0.2]] * 3,
-            swir22=[[0.15, 0.15, 0.15]] * 3,
-        )
-        result = compute_all_indices(ds, ["ndvi", "ndmi", "nbr", "evi2"])
-        assert "ndvi" in result
-        assert "ndmi" in result
-        assert "nbr" in result
-        assert "evi2" in result
+    def test_compute_all(self, bands_ds):
+        result = compute_all_indices(bands_ds, ["ndvi", "ndmi", "nbr", "evi2"])
+        assert {"ndvi", "ndmi", "nbr", "evi2"}.issubset(result.data_vars)
@@ -0,0 +1,147 @@
+"""Tests for seasonal decomposition and harmonic fitting."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.timeseries.seasonal import (
+    detect_breaks_harmonic,
+    harmonic_fit,
+    harmonic_fit_stack,
+    stl_decomposition,
+    stl_decomposition_batch,
+)
+
+
+def _seasonal_series(n=96, period=12, seed=0):
+    """Synthetic series: linear trend + annual cycle + noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    return 0.001 * t + 0.2 * np.sin(2 * np.pi * t / period) + rng.normal(0, 0.02, n)
+
+
+class TestSTLBatch:
+    def test_matches_per_series_stl(self):
+        stack = np.stack([_seasonal_series(seed=s) for s in range(3)])
+        result = stl_decomposition_batch(stack, period=12)
+
+        for i, series in enumerate(stack):
+            single = stl_decomposition(pd.DataFrame({"mean": series}), period=12)
+            np.testing.assert_allclose(result["trend"][i], single["trend"].values)
+            np.testing.assert_allclose(result["seasonal"][i], single["seasonal"].values)
+
+    def test_short_series_passthrough(self):
+        stack = np.ones((2, 10))
+        result = stl_decomposition_batch(stack, period=12)
+        np.testing.assert_array_equal(result["trend"], stack)
+        assert not result["seasonal"].any()
+
+    def test_numba_batch_matches_statsmodels(self):
+        pytest.importorskip("numba")
+        stack = np.stack([_seasonal_series(seed=s) for s in range(3)])
+        fast = stl_decomposition_batch(stack, period=12, backend="numba")
+        ref = stl_decomposition_batch(stack, period=12, backend="statsmodels")
+        for key in ("trend", "seasonal", "residual"):
+            np.testing.assert_allclose(fast[key], ref[key], atol=1e-10)
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            stl_decomposition_batch(np.ones((2, 48)), period=12, backend="cuda")
+
+
+class TestSTLBackends:
+    def test_numba_matches_statsmodels(self):
+        pytest.importorskip("numba")
+        series = _seasonal_series(n=120)
+        series[17] += 1.0  # outlier exercises the robustness weights
+        df = pd.DataFrame({"mean": series})
+
+        fast = stl_decomposition(df, period=12, backend="numba")
+        ref = stl_decomposition(df, period=12, backend="statsmodels")
+
+        for key in ("trend", "seasonal", "residual"):
+            np.testing.assert_allclose(fast[key].values, ref[key].values, atol=1e-10)
+
+    @pytest.mark.parametrize("n_periods", [2, 3])
+    def test_auto_uses_statsmodels_on_short_series(self, n_periods):
+        series = _seasonal_series(n=12 * n_periods)
+        df = pd.DataFrame({"mean": series})
+
+        auto = stl_decomposition(df, period=12)
+        ref = stl_decomposition(df, period=12, backend="statsmodels")
+
+        for key in ("trend", "seasonal", "residual"):
+            np.testing.assert_array_equal(auto[key].values, ref[key].values)
+
+    def test_zero_mad_keeps_all_weights(self):
+        pytest.importorskip("numba")
+        from src.timeseries._stl_numba import _robustness_weights
+
+        resid = np.array([0.0, 0.0, 0.0, 1.0, -2.0])
+        np.testing.assert_array_equal(_robustness_weights(resid), np.ones(5))
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            stl_decomposition(pd.DataFrame({"mean": _seasonal_series()}), backend="gpu")
+
+
+class TestHarmonicFitStack:
+    def test_matches_per_pixel_fit(self):
+        dates = pd.date_range("2020-01-01", periods=200, freq="5D")
+        rng = np.random.default_rng(1)
+        doy = dates.dayofyear.values / 365.25
+        stack = np.stack([
+            0.4 + a * np.cos(2 * np.pi * doy) + rng.normal(0, 0.02, len(dates))
+            for a in (0.1, 0.2, 0.3)
+        ])
+
+        result = harmonic_fit_stack(dates, stack, n_harmonics=2, time_batch=64)
+
+        for i, series in enumerate(stack):
+            single = harmonic_fit(dates, series, n_harmonics=2)
+            np.testing.assert_allclose(result["coefficients"][i], single["coefficients"], atol=1e-6)
+            np.testing.assert_allclose(result["rmse"][i], single["rmse"], rtol=1e-5)
+
+    def test_rejects_nan(self):
+        dates = pd.date_range("2020-01-01", periods=20, freq="5D")
+        stack = np.ones((2, 20))
+        stack[0, 3] = np.nan
+        with pytest.raises(ValueError):
+            harmonic_fit_stack(dates, stack)
+
+
+class TestHarmonicFit:
+    def test_recovers_known_coefficients(self):
+        dates = pd.date_range("2019-01-01", periods=150, freq="5D")
+        t = 2 * np.pi * dates.dayofyear.values / 365.25
+        values = 0.5 + 0.2 * np.cos(t) - 0.1 * np.sin(t)
+
+        fit = harmonic_fit(dates, values, n_harmonics=1)
+
+        np.testing.assert_allclose(fit["coefficients"], [0.5, 0.2, -0.1], atol=1e-4)
+        assert fit["rmse"] < 1e-4
+
+    def test_singular_design_falls_back(self):
+        """All observations on one day of year: X'X is singular."""
+        dates = pd.DatetimeIndex(["2019-03-01", "2021-03-01", "2022-03-01", "2023-03-01"])
+        fit = harmonic_fit(dates, np.array([0.4, 0.5, 0.6, 0.5]), n_harmonics=1)
+        assert np.isfinite(fit["rmse"])
+
+    def test_reports_float64(self):
+        dates = pd.date_range("2019-01-01", periods=40, freq="15D")
+        fit = harmonic_fit(dates, np.full(40, 0.3), n_harmonics=1)
+        assert fit["fitted"].dtype == np.float64
+        assert fit["residuals"].dtype == np.float64
+
+
+class TestDetectBreaksHarmonic:
+    def test_break_values_are_not_rounded_to_float32(self):
+        dates = pd.date_range("2019-01-01", periods=100, freq="15D")
+        values = np.full(100, 0.7)
+        values[::2] += 0.01
+        values[80:] = 0.3
+
+        breaks = detect_breaks_harmonic(dates, values, history_end=str(dates[79].date()))
+
+        assert breaks
+        assert breaks[0]["value"] == 0.3
@@ -1,51 +1,94 @@
 """Tests for SPI (Standardized Precipitation Index) computation."""
 
+import math
+
 import numpy as np
 import pytest
 
-from src.processing.spi import compute_spi, compute_spi_3month
+from src.processing.spi import compute_spi, compute_spi_3month, compute_spi_batched
+
+# Synthetic precipitation drawn once per module; tests only read these,
+# so they are shared as read-only arrays.
+_REF100 = np.random.default_rng(42).gamma(shape=2, scale=50, size=100)
+_REF60 = np.random.default_rng(42).gamma(shape=2, scale=50, size=60)
+_REF100.flags.writeable = False
+_REF60.flags.writeable = False
+_MEAN, _P5, _P95 = _REF100.mean(), *np.percentile(_REF100, [5, 95])
+
+# Reference followed by one target slot, allocated once (compute_spi does not
+# modify its input)
+_BUF = np.empty(101)
+_BUF[:100] = _REF100
+
+
+def _with_target(value: float) -> np.ndarray:
+    """_REF100 with ``value`` appended, written into the shared buffer."""
+    _BUF[100] = value
+    return _BUF
+
+
+@pytest.fixture(scope="module")
+def ref100():
+    """100 draws from Gamma(2, 50): the SPI reference period."""
+    return _REF100
+
+
+@pytest.fixture(scope="module")
+def ref60():
+    """60 draws from Gamma(2, 50): five years of monthly rainfall."""
+    return _REF60
 
 
 class TestComputeSPI:
     def test_average_rainfall_near_zero(self):
         """Average rainfall should produce SPI near 0."""
-        # Generate synthetic precipitation from a gamma distribution
-        np.random.seed(42)
-        ref = np.random.gamma(shape=2, scale=50, size=100)
         # Target value = mean of the reference → SPI should be near 0
-        target_val = np.mean(ref)
-        data = np.append(ref, target_val)
+        target_val = _MEAN
+        data = _with_target(target_val)
         spi = compute_spi(data)
         assert -0.5 < spi < 0.5, f"SPI for mean rainfall should be near 0, got {spi}"
 
     def test_drought_negative_spi(self):
         """Well-below-average rainfall should produce negative SPI."""
-        np.random.seed(42)
-        ref = np.random.gamma(shape=2, scale=50, size=100)
         # Target value = very low (10th percentile)
-        target_val = np.percentile(ref, 5)
-        data = np.append(ref, target_val)
+        target_val = _P5
+        data = _with_target(target_val)
         spi = compute_spi(data)
         assert spi < -1.0, f"SPI for drought should be < -1.0, got {spi}"
 
     def test_wet_positive_spi(self):
         """Well-above-average rainfall should produce positive SPI."""
-        np.random.seed(42)
-        ref = np.random.gamma(shape=2, scale=50, size=100)
         # Target value = 95th percentile
-        target_val = np.percentile(ref, 95)
-        data = np.append(ref, target_val)
+        target_val = _P95
+        data = _with_target(target_val)
         spi = compute_spi(data)
         assert spi > 1.0, f"SPI for wet conditions should be > 1.0, got {spi}"
 
     def test_zero_rainfall(self):
         """Zero rainfall should produce a negative SPI."""
-        np.random.seed(42)
-        ref = np.random.gamma(shape=2, scale=50, size=100)
-        data = np.append(ref, 0.0)
+        data = _with_target(0.0)
         spi = compute_spi(data)
         assert spi < 0, f"SPI for zero rainfall should be negative, got {spi}"
 
+    def test_does_not_use_gamma_optimizer(self, monkeypatch):
+        """The gamma fit is closed-form; stats.gamma.fit must not be called."""
+        from scipy import stats
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("stats.gamma.fit called")
+
+        monkeypatch.setattr(stats.gamma, "fit", _fail)
+        assert compute_spi(_with_target(_MEAN)) == pytest.approx(
+            compute_spi_batched(_with_target(_MEAN))[-1], abs=1e-9
+        )
+
+    def test_negative_target_clamped_like_batched(self):
+        """Negative (bad) precipitation is treated as zero, not NaN."""
+        spi = compute_spi(np.array([-5.0]), reference_period=_REF100)
+        assert spi == pytest.approx(compute_spi(np.array([0.0]), reference_period=_REF100))
+        batched = compute_spi_batched(np.array([-5.0]), reference_period=_REF100)
+        assert spi == pytest.approx(batched[-1])
+
     def test_handles_nan(self):
         """NaN target should return 0."""
         data = np.array([50.0, 60.0, 70.0, np.nan])
@@ -60,27 +103,119 @@ class TestComputeSPI:
         assert isinstance(spi, float)
 
 
+class TestComputeSPIVectorized:
+    def test_compute_spi_vectorized(self):
+        """A (T, H, W) stack should give an (H, W) SPI matching the 1-D path."""
+        data = np.broadcast_to(_with_target(_MEAN)[:, None, None], (101, 4, 4))
+        spi = compute_spi(data, axis=0)
+        assert spi.shape == (4, 4)
+        assert np.isfinite(spi).all()
+        np.testing.assert_allclose(spi, compute_spi(_with_target(_MEAN)), atol=1e-6)
+
+    def test_dry_column_negative(self):
+        """Pixels whose last time step is dry should get negative SPI."""
+        data = np.repeat(_with_target(_MEAN)[:, None, None], 4, axis=1).repeat(4, axis=2)
+        data[-1, :, 0] = _P5
+        spi = compute_spi(data, axis=0)
+        assert (spi[:, 0] < -1.0).all()
+        assert (np.abs(spi[:, 1:]) < 0.5).all()
+
+    def test_batched_returns_every_time_step(self, ref100):
+        spi = compute_spi_batched(np.stack([ref100, ref100[::-1]], axis=1))
+        assert spi.shape == (100, 2)
+        np.testing.assert_allclose(spi[:, 0], spi[::-1, 1])
+
+    def test_failed_gamma_fit_falls_back_per_column(self, ref100):
+        """A nearly constant column rounds the MLE input to <= 0."""
+        flat = 100.0 + np.random.default_rng(0).normal(0, 1e-8, 100)
+        stack = np.stack([flat, ref100], axis=1)
+
+        spi = compute_spi_batched(stack)
+
+        assert np.isfinite(spi).all()
+        assert spi[-1, 0] == pytest.approx(compute_spi(flat), rel=1e-4)
+        np.testing.assert_allclose(spi[:, 1], compute_spi_batched(ref100))
+
+    def test_nan_target_gives_zero(self):
+        data = np.array([[50.0, 60.0, 70.0, np.nan]]).T
+        assert compute_spi(data, axis=0)[0] == 0.0
+
+
+class TestSPINumba:
+    @pytest.mark.parametrize("target", [0.0, _P5, _MEAN, _P95, np.nan])
+    def test_kernel_matches_compute_spi(self, target):
+        pytest.importorskip("numba")
+        from src.processing.spi import _spi_kernel_jit
+
+        expected = compute_spi(_with_target(target), reference_period=_REF100)
+        assert math.isclose(_spi_kernel_jit(_REF100, target), expected, abs_tol=1e-6)
+
+    def test_kernel_matches_fallbacks(self):
+        pytest.importorskip("numba")
+        from src.processing.spi import _spi_kernel_jit
+
+        few = np.array([50.0, 60.0, 70.0, 20.0])
+        constant = np.full(20, 5.0)
+        flat = 100.0 + np.random.default_rng(0).normal(0, 1e-8, 100)
+        for ref, target in ((few, 30.0), (constant, 8.0), (flat, 100.0)):
+            expected = compute_spi(np.append(ref, target), reference_period=ref)
+            spi = _spi_kernel_jit(ref, target)
+            assert math.isclose(spi, expected, rel_tol=1e-4, abs_tol=1e-6)
+
+    def test_special_functions_match_scipy(self):
+        pytest.importorskip("numba")
+        from scipy import special
+
+        from src.processing._spi_numba import _digamma, _gammainc, _ndtri, _trigamma
+
+        for a in (0.5, 1.0, 2.3, 7.0, 40.0):
+            assert math.isclose(_digamma(a), special.digamma(a), rel_tol=1e-12)
+            assert math.isclose(_trigamma(a), special.polygamma(1, a), rel_tol=1e-12)
+            for x in (0.01, 0.5, a, 3 * a + 1):
+                assert math.isclose(_gammainc(a, x), special.gammainc(a, x), abs_tol=1e-13)
+        for p in (0.001, 0.02, 0.3, 0.5, 0.77, 0.999):
+            assert math.isclose(_ndtri(p), special.ndtri(p), abs_tol=1e-13)
+
+
+@pytest.mark.gpu
+class TestComputeSPICuPy:
+    def test_cupy_input_stays_on_device(self):
+        cp = pytest.importorskip("cupy")
+        data = _with_target(_P5)
+
+        spi = compute_spi(cp.asarray(data))
+
+        assert type(spi).__module__.startswith("cupy")
+        assert abs(float(spi) - compute_spi(data)) < 1e-6
+
+
 class TestComputeSPI3Month:
-    def test_basic_computation(self):
+    def test_basic_computation(self, ref60):
         """SPI-3 should work with sufficient monthly data."""
-        np.random.seed(42)
         # 5 years of monthly data (60 months)
-        monthly = list(np.random.gamma(shape=2, scale=50, size=60))
+        monthly = ref60
         spi = compute_spi_3month(monthly)
         assert isinstance(spi, float)
         assert -4 < spi < 4  # SPI rarely exceeds ±3
 
-    def test_drought_signal(self):
+    def test_drought_signal(self, ref60):
         """Three very dry months after wet history should give negative SPI."""
-        np.random.seed(42)
-        # Normal rainfall for 57 months
-        normal = list(np.random.gamma(shape=2, scale=50, size=57))
-        # Then 3 very dry months
-        drought = [5.0, 3.0, 2.0]
-        monthly = normal + drought
+        # Normal rainfall for 57 months, then 3 very dry months
+        monthly = np.concatenate([ref60[:57], [5.0, 3.0, 2.0]])
         spi = compute_spi_3month(monthly)
         assert spi < -1.0, f"SPI-3 after drought should be < -1.0, got {spi}"
 
+    def test_matches_rolling_sum_reference(self, ref60):
+        """SPI-3 equals a gamma SPI of the last np.convolve 3-month sum."""
+        from scipy import special, stats
+
+        rolling = np.convolve(ref60, np.ones(3), "valid")
+        shape, _, scale = stats.gamma.fit(rolling, floc=0)
+        cdf = np.clip(special.gdtr(1 / scale, shape, rolling[-1]), 0.001, 0.999)
+        expected = stats.norm.ppf(cdf)
+
+        assert abs(compute_spi_3month(ref60.tolist()) - expected) < 1e-6
+
     def test_too_few_months(self):
         """Less than 3 months should return 0."""
         spi = compute_spi_3month([50.0, 60.0])
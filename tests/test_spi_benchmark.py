@@ -0,0 +1,15 @@
+"""Benchmark for the scalar SPI path (needs pytest-benchmark)."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.processing.spi import compute_spi  # noqa: E402
+
+_DATA = np.append(np.random.default_rng(42).gamma(shape=2, scale=50, size=100), 90.0)
+
+
+def test_spi_perf(benchmark):
+    spi = benchmark(compute_spi, _DATA)
+    assert np.isfinite(spi)
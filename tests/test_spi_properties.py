@@ -0,0 +1,42 @@
+"""Property tests: scalar and batched SPI must agree (needs hypothesis)."""
+
+import math
+
+import numpy as np
+import pytest
+
+pytest.importorskip("hypothesis")
+
+from hypothesis import given, settings  # noqa: E402
+from hypothesis import strategies as st  # noqa: E402
+
+from src.processing.spi import compute_spi, compute_spi_batched  # noqa: E402
+
+
+@settings(max_examples=50, deadline=None)
+@given(
+    n=st.integers(30, 200),
+    shape=st.floats(1, 5),
+    scale=st.floats(10, 100),
+    seed=st.integers(0, 2**32 - 1),
+)
+def test_scalar_matches_batched(n, shape, scale, seed):
+    data = np.random.default_rng(seed).gamma(shape, scale, n)
+    assert math.isclose(
+        compute_spi(data), compute_spi_batched(data[:, None])[-1, 0], abs_tol=1e-6
+    )
+
+
+@settings(max_examples=25, deadline=None)
+@given(
+    n=st.integers(30, 120),
+    dry_fraction=st.floats(0, 0.5),
+    seed=st.integers(0, 2**32 - 1),
+)
+def test_scalar_matches_batched_with_dry_months(n, dry_fraction, seed):
+    rng = np.random.default_rng(seed)
+    data = rng.gamma(2.0, 50.0, n)
+    data[rng.random(n) < dry_fraction] = 0.0
+    assert math.isclose(
+        compute_spi(data), compute_spi_batched(data[:, None])[-1, 0], abs_tol=1e-6
+    )
@@ -0,0 +1,74 @@
+"""Tests for Mann-Kendall / Sen's slope trend analysis."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from src.timeseries.trends import analyze_trend_stack, mann_kendall_test, sens_slope
+
+
+class TestMannKendall:
+    def test_increasing_trend(self):
+        values = np.arange(20, dtype=float) + np.random.default_rng(0).normal(0, 0.1, 20)
+        result = mann_kendall_test(values)
+        assert result["trend"] == "increasing"
+        assert result["significant"]
+
+    def test_tie_correction(self):
+        """Tied values reduce var(S); p-value must match the corrected formula."""
+        values = np.array([1.0, 2.0, 2.0, 3.0, 3.0, 3.0, 4.0, 5.0, 4.0, 6.0])
+        n = len(values)
+        s = sum(
+            np.sign(values[j] - values[i]) for i in range(n - 1) for j in range(i + 1, n)
+        )
+        var_s = (n * (n - 1) * (2 * n + 5) - 2 * 1 * 9 - 3 * 2 * 11 - 2 * 1 * 9) / 18
+        z = (s - 1) / np.sqrt(var_s)
+
+        result = mann_kendall_test(values)
+        assert result["p_value"] == pytest.approx(2 * (1 - stats.norm.cdf(z)))
+
+    def test_insufficient_data(self):
+        result = mann_kendall_test(np.array([1.0, np.nan, 2.0]))
+        assert result["trend"] == "insufficient_data"
+
+
+class TestSensSlope:
+    def test_linear_slope_per_year(self):
+        dates = pd.date_range("2020-01-01", periods=40, freq="30D")
+        years = (dates - dates[0]).days / 365.25
+        values = 0.3 + 0.05 * years.values
+
+        result = sens_slope(dates, values)
+        assert result["slope"] == pytest.approx(0.05, rel=1e-4)
+        assert result["intercept"] == pytest.approx(0.3, abs=1e-4)
+
+    def test_float64_input_keeps_precision(self):
+        dates = pd.date_range("2020-01-01", periods=20, freq="30D")
+        values = 0.3 + 1e-9 * np.arange(20)
+
+        result = sens_slope(dates, values)
+        assert result["slope"] > 0
+
+
+class TestAnalyzeTrendStack:
+    def test_matches_per_pixel_functions(self):
+        pytest.importorskip("numba")
+        dates = pd.date_range("2020-01-01", periods=30, freq="15D")
+        rng = np.random.default_rng(3)
+        stack = rng.normal(0.4, 0.05, (5, 30)) + np.linspace(-0.1, 0.1, 5)[:, None] * np.arange(30) / 30
+        stack[1, [2, 7, 11]] = np.nan
+        stack[2, :28] = np.nan  # too few observations
+        stack[3, 10:14] = 0.5  # ties
+        stack[4, 5] = stack[4, 6] + 1e-9  # distinct in float64, tied in float32
+
+        result = analyze_trend_stack(dates, stack)
+
+        for i, row in enumerate(stack):
+            mk = mann_kendall_test(row)
+            ss = sens_slope(dates, row)
+            assert result["tau"][i] == pytest.approx(mk["tau"])
+            assert result["p_value"][i] == pytest.approx(mk["p_value"])
+            assert result["significant"][i] == mk["significant"]
+            assert result["slope"][i] == pytest.approx(ss["slope"])
+            assert result["n"][i] == mk["n"]